@@ -1,7 +1,13 @@
 from abc import ABC, abstractmethod
+from collections import OrderedDict
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
 import os
+import threading
+import time
 import requests
 import json
+from circuit_breaker import CircuitBreaker
+from latency_tracker import LatencyTracker
 
 
 class APIBase(ABC):
@@ -15,6 +21,19 @@ class APIBase(ABC):
         self.base_url = None
         self.headers = {}
         self.timeout = 10
+        self.cache = None
+        self.cache_ttl = 300
+        self.key_pool = None
+        self.api_key_header = None
+        self.circuit_breaker = CircuitBreaker()
+        self.latency = LatencyTracker()
+        self.hedge_requests = False
+        self.hedge_budget = 0.1
+        self.requests_sent = 0
+        self.hedges_sent = 0
+        self._hedge_executor = None
+        self.pending_refreshes = OrderedDict()
+        self._local = threading.local()
 
     @abstractmethod
     def configure_api(self):
@@ -57,14 +76,22 @@ class APIBase(ABC):
         """
         pass
 
-    def make_request(self, endpoint="", params=None, method="GET"):
+    def make_request(self, endpoint="", params=None, method="GET",
+                     cache_ttl=None):
         """
         Make an HTTP request to the API.
 
+        GET responses are served from and stored in self.cache when one
+        is configured. While the network is unreachable (or the circuit
+        breaker is open) the last cached copy is returned regardless of
+        age and the request is queued for refresh; see staleness_note().
+
         Args:
             endpoint (str): API endpoint path (appended to base_url)
             params (dict): Query parameters for the request
             method (str): HTTP method (GET, POST, etc.)
+            cache_ttl (float): Maximum age of a cached response in seconds
+                (defaults to self.cache_ttl; 0 bypasses the cache lookup)
 
         Returns:
             dict: Parsed JSON response from the API, or None if request fails
@@ -74,41 +101,294 @@ class APIBase(ABC):
                 "base_url not configured. Call configure_api() first.")
 
         url = f"{self.base_url}{endpoint}"
+        headers = dict(self.headers)
+
+        self._local.source = ("network", None)
+        self._local.error_status = None
+        cache_key = None
+        if self.cache is not None and method.upper() == "GET":
+            cache_key = self.cache.make_key(endpoint, params)
+            ttl = self.cache_ttl if cache_ttl is None else cache_ttl
+            if ttl:
+                entry = self.cache.get_entry(cache_key, max_age=ttl)
+                if entry is not None:
+                    self._local.source = ("cache", entry[1])
+                    return entry[0]
+
+        request = (endpoint, params, method)
+        if (self.circuit_breaker is not None
+                and not self.circuit_breaker.allow_request()):
+            return self._serve_offline(cache_key, request)
 
         try:
-            if method.upper() == "GET":
-                response = requests.get(
-                    url,
-                    params=params,
-                    headers=self.headers,
-                    timeout=self.timeout
-                )
-            elif method.upper() == "POST":
-                response = requests.post(
-                    url,
-                    json=params,
-                    headers=self.headers,
-                    timeout=self.timeout
-                )
-            else:
-                raise ValueError(f"Unsupported HTTP method: {method}")
+            while True:
+                api_key = None
+                if self.key_pool is not None:
+                    api_key = self.key_pool.acquire()
+                    if api_key is None:
+                        print("Error: All API keys are exhausted or disabled. "
+                              "Please wait before retrying.")
+                        return self._serve_offline(cache_key, request)
+                    headers[self.api_key_header] = api_key.key
+
+                # Each response is recorded against its key by _send_once()
+                response = self._send(method, url, params, headers, endpoint,
+                                      api_key)
+                if self.circuit_breaker is not None:
+                    self.circuit_breaker.record_success()
+
+                # Retry rejected requests with another key if one is left
+                if (api_key is not None
+                        and response.status_code in self.key_pool.ROTATE_STATUSES
+                        and self.key_pool.available()):
+                    continue
+                break
 
             response.raise_for_status()
-            return response.json()
+            data = response.json()
+            if cache_key is not None:
+                self.cache.set(cache_key, data)
+                self.pending_refreshes.pop(cache_key, None)
+            return data
 
         except requests.exceptions.HTTPError as e:
+            self._local.error_status = response.status_code
             self._handle_http_error(response.status_code, e)
         except requests.exceptions.Timeout:
-            print(f"Error: Request timed out after {self.timeout} seconds.")
+            timeout = getattr(self._local, "timeout", self.timeout)
+            print(f"Error: Request timed out after {timeout:g} seconds.")
+            return self._network_failed(cache_key, request)
         except requests.exceptions.ConnectionError:
             print("Error: Connection failed. Please check your internet connection.")
+            return self._network_failed(cache_key, request)
         except requests.exceptions.RequestException as e:
             print(f"Network error: {e}")
         except json.JSONDecodeError:
             print("Error: Invalid JSON response from API.")
+        finally:
+            # Free a half-open probe slot on paths that recorded no outcome
+            # (no usable key, other request errors), or it stays taken
+            if self.circuit_breaker is not None:
+                self.circuit_breaker.release()
 
         return None
 
+    def _network_failed(self, cache_key, request):
+        """Record a connection failure and fall back to cached data."""
+        if self.circuit_breaker is not None:
+            self.circuit_breaker.record_failure()
+        return self._serve_offline(cache_key, request)
+
+    def _serve_offline(self, cache_key, request):
+        """
+        Return the last cached copy of a request, whatever its age, and
+        queue the request to be refreshed once the network is back.
+
+        Args:
+            cache_key (str): Cache key of the request, or None if uncacheable
+            request (tuple): (endpoint, params, method) to replay later
+
+        Returns:
+            Cached response data, or None if nothing is cached
+        """
+        if cache_key is None:
+            return None
+
+        self.pending_refreshes[cache_key] = request
+        entry = self.cache.get_entry(cache_key)
+        if entry is None:
+            print("Error: Offline and no cached data is available for this request.")
+            return None
+
+        self._local.source = ("offline", entry[1])
+        return entry[0]
+
+    def last_source(self):
+        """
+        Describe where the last make_request() result on this thread came from.
+
+        Returns:
+            tuple: (source, stored_at) where source is 'network', 'cache'
+                or 'offline' and stored_at is the cache timestamp (or None)
+        """
+        return getattr(self._local, "source", ("network", None))
+
+    def staleness_note(self):
+        """
+        Return a note to show under output served from the offline cache.
+
+        Returns:
+            str: The note, or an empty string if the data is not stale
+        """
+        source, stored_at = self.last_source()
+        if source != "offline":
+            return ""
+
+        age = max(0, int(time.time() - stored_at))
+        if age < 3600:
+            age_text = f"{age // 60} min"
+        elif age < 86400:
+            age_text = f"{age // 3600} h"
+        else:
+            age_text = f"{age // 86400} days"
+        return (f"[Offline] Showing cached data from {age_text} ago. "
+                "It will refresh when the connection returns.")
+
+    def is_offline(self):
+        """True while the circuit breaker is refusing network requests."""
+        return self.circuit_breaker is not None and self.circuit_breaker.is_open
+
+    def process_refresh_queue(self):
+        """
+        Replay requests that were served from the offline cache.
+        Stops at the first request that still cannot reach the network.
+        Requests the API rejects as invalid (4xx other than 401/403/429)
+        are dropped; other API errors stay queued for later.
+
+        Returns:
+            int: Number of cached responses refreshed
+        """
+        refreshed = 0
+        for cache_key, (endpoint, params, method) in list(
+                self.pending_refreshes.items()):
+            if (self.circuit_breaker is not None
+                    and not self.circuit_breaker.ready()):
+                break
+            data = self.make_request(endpoint, params, method, cache_ttl=0)
+            if self.last_source()[0] != "network":
+                break
+            if data is None:
+                if self._is_permanent_error(
+                        getattr(self._local, "error_status", None)):
+                    # Replaying won't help and would spend quota every time
+                    self.pending_refreshes.pop(cache_key, None)
+                continue
+            self.pending_refreshes.pop(cache_key, None)
+            refreshed += 1
+        return refreshed
+
+    @staticmethod
+    def _is_permanent_error(status_code):
+        """True for HTTP errors that retrying the same request can't fix."""
+        return (status_code is not None and 400 <= status_code < 500
+                and status_code not in (401, 403, 429))
+
+    def _send(self, method, url, params, headers, endpoint="", api_key=None):
+        """
+        Send an HTTP request with an adaptive timeout, hedging idempotent
+        GETs when self.hedge_requests is enabled.
+
+        Args:
+            method (str): HTTP method (GET or POST)
+            url (str): Full request URL
+            params (dict): Query parameters (GET) or JSON body (POST)
+            headers (dict): Request headers
+            endpoint (str): Endpoint path used to group latency samples
+            api_key (APIKey): Pooled key set in headers, or None
+
+        Returns:
+            requests.Response: The raw response
+        """
+        timeout = self.timeout
+        if self.latency is not None:
+            timeout = self.latency.timeout_for(endpoint, self.timeout)
+        self._local.timeout = timeout
+        self.requests_sent += 1
+
+        delay = None
+        if self.hedge_requests and self.latency is not None \
+                and method.upper() == "GET":
+            delay = self.latency.hedge_delay(endpoint)
+        if delay is None:
+            return self._send_once(method, url, params, headers, timeout,
+                                   endpoint, api_key)
+        return self._send_hedged(url, params, headers, timeout, endpoint,
+                                 delay, api_key)
+
+    def _send_hedged(self, url, params, headers, timeout, endpoint, delay,
+                     api_key=None):
+        """
+        Send a GET, and a second copy if the first is still pending after
+        `delay` seconds and the hedge budget allows; return whichever
+        response arrives first. With a key pool, the copy is sent with
+        its own key from the pool and both responses count against quota.
+        """
+        if self._hedge_executor is None:
+            self._hedge_executor = ThreadPoolExecutor(
+                8, thread_name_prefix="hedge")
+        submit = self._hedge_executor.submit
+        first = submit(self._send_once, "GET", url, params, headers, timeout,
+                       endpoint, api_key)
+        done, _ = wait([first], timeout=delay)
+        if done or self.hedges_sent >= self.hedge_budget * self.requests_sent:
+            return first.result()
+
+        hedge_key = None
+        hedge_headers = dict(headers)
+        if api_key is not None:
+            hedge_key = self.key_pool.acquire()
+            if hedge_key is None:
+                return first.result()
+            hedge_headers[self.api_key_header] = hedge_key.key
+
+        self.hedges_sent += 1
+        pending = {first, submit(self._send_once, "GET", url, params,
+                                 hedge_headers, timeout, endpoint, hedge_key)}
+        error = None
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                try:
+                    return future.result()
+                except requests.exceptions.RequestException as e:
+                    error = e
+        raise error
+
+    def _send_once(self, method, url, params, headers, timeout, endpoint="",
+                   api_key=None):
+        """
+        Send a single HTTP request, record its latency and, when sent with
+        a pooled key, record the response against that key's quota.
+
+        Args:
+            method (str): HTTP method (GET or POST)
+            url (str): Full request URL
+            params (dict): Query parameters (GET) or JSON body (POST)
+            headers (dict): Request headers
+            timeout (float): Seconds to wait for the response
+            endpoint (str): Endpoint path used to group latency samples
+            api_key (APIKey): Pooled key set in headers, or None
+
+        Returns:
+            requests.Response: The raw response
+        """
+        started = time.perf_counter()
+        try:
+            if method.upper() == "GET":
+                response = requests.get(
+                    url,
+                    params=params,
+                    headers=headers,
+                    timeout=timeout
+                )
+            elif method.upper() == "POST":
+                response = requests.post(
+                    url,
+                    json=params,
+                    headers=headers,
+                    timeout=timeout
+                )
+            else:
+                raise ValueError(f"Unsupported HTTP method: {method}")
+            if api_key is not None:
+                self.key_pool.record_response(
+                    api_key, response.status_code, response.headers)
+            return response
+        finally:
+            if self.latency is not None:
+                # Timeouts are recorded too, so the timeout can grow again
+                self.latency.record(endpoint, time.perf_counter() - started)
+
     def _handle_http_error(self, status_code, error):
         """
         Handle HTTP errors with appropriate messages.
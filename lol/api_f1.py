@@ -2,6 +2,8 @@ import os
 import requests
 import json
 from abc_api_base import APIBase
+from endpoints import F1_ENDPOINTS
+from key_pool import KeyPool
 import dotenv
 dotenv.load_dotenv()
 
@@ -36,14 +38,29 @@ class F1API(APIBase):
         "20": {"name": "Daniel Ricciardo", "id": "4524", "team": "AlphaTauri"}
     }
 
+    # Endpoint definitions keyed by endpoint_type (see endpoints.py)
+    ENDPOINTS = F1_ENDPOINTS
+
     def __init__(self):
         """Initialize F1 API with base URL and headers."""
         super().__init__()
         self.configure_api()
 
     def configure_api(self):
-        """Configure F1 API settings."""
-        self.api_key = "12f7ba7e0bmsha880fa500da986fp1423afjsn8b48944f0c3e"
+        """
+        Configure F1 API settings.
+
+        Several RapidAPI keys can be pooled by listing them, comma-separated,
+        in OWM_API_KEYS; requests are then spread across all of them.
+        """
+        api_keys = [key.strip()
+                    for key in os.getenv("OWM_API_KEYS", "").split(",")
+                    if key.strip()]
+        if not api_keys:
+            api_keys = [os.getenv(
+                "OWM_API_KEY", "12f7ba7e0bmsha880fa500da986fp1423afjsn8b48944f0c3e")]
+
+        self.api_key = api_keys[0]
         self.base_url = "https://f1-motorsport-data.p.rapidapi.com"
         self.headers = {
             "x-rapidapi-host": "f1-motorsport-data.p.rapidapi.com",
@@ -53,73 +70,83 @@ class F1API(APIBase):
             raise ValueError(
                 "Error: F1 Motorsport Data API key not found. Please set OWM_API_KEY in your .env file.")
 
+        self.key_pool = KeyPool(api_keys)
+        self.api_key_header = "x-rapidapi-key"
+
     def validate_input(self, **kwargs):
         """
         Validate user input before making API call.
 
         Args:
-            **kwargs: Should contain 'eventId' or 'driverId' parameter
+            **kwargs: Should contain 'eventId', 'athleteId' or 'driverId',
+                or an 'endpoint_type' whose parameters should be checked
 
         Returns:
             bool: True if valid, False otherwise
         """
-        # Validate Event ID for race reports
-        event_id = kwargs.get('eventId')
-        if event_id is not None:
-            if event_id == "":
-                print("Error: Event ID is required.")
-                return False
-            if not str(event_id).isdigit():
-                print("Invalid input. Event ID should be numeric.")
+        endpoint_type = kwargs.get('endpoint_type')
+        if endpoint_type is not None:
+            endpoint = self.ENDPOINTS.get(endpoint_type)
+            if endpoint is None:
+                print(f"Error: Unknown endpoint type '{endpoint_type}'.")
                 return False
-            return True
+            return endpoint.validate(kwargs)
 
-        # Validate Driver ID for driver stats
-        driver_id = kwargs.get('driverId')
-        if driver_id is not None:
-            if driver_id == "":
-                print("Error: Driver ID is required.")
-                return False
-            if not str(driver_id).isdigit():
-                print("Invalid input. Driver ID should be numeric.")
-                return False
-            return True
-
-        return False
+        # No endpoint given: validate whichever known parameters were passed
+        params = [(self.ENDPOINTS.param(name), value)
+                  for name, value in kwargs.items()]
+        params = [(param, value) for param, value in params if param]
+        if not params:
+            return False
+        return all(param.validate(value) for param, value in params)
 
     def fetch_data(self, **kwargs):
         """
         Fetch data from the API based on endpoint type.
 
         Args:
-            **kwargs: Should contain endpoint-specific parameters
+            **kwargs: Should contain endpoint-specific parameters, and
+                optionally 'cache_ttl' to override the endpoint's cache
+                policy (0 always fetches fresh data)
 
         Returns:
-            dict: Parsed JSON response from the API
+            dict: Parsed JSON response from the API, or None if the request
+                failed or the response is not of the endpoint's response_type
         """
-        endpoint_type = kwargs.get('endpoint_type', 'race-report')
-
-        if endpoint_type == 'race-report':
-            event_id = kwargs.get('eventId')
-            endpoint = "/race-report"
-            params = {"eventId": event_id}
-        elif endpoint_type == 'athlete-info':
-            athlete_id = kwargs.get('athleteId')
-            endpoint = "/athlete-info"
-            params = {"athleteId": athlete_id}
-        elif endpoint_type == 'race-results':
-            driver_id = kwargs.get('driverId')
-            year = kwargs.get('year', '2024')
-            endpoint = "/race-results"
-            params = {"driverId": driver_id, "year": year}
-        elif endpoint_type == 'stats':
-            driver_id = kwargs.get('driverId')
-            endpoint = "/stats"
-            params = {"driverId": driver_id}
-        else:
+        endpoint = self.ENDPOINTS.get(
+            kwargs.get('endpoint_type', 'race-report'))
+        if endpoint is None:
             return None
 
-        return self.make_request(endpoint=endpoint, params=params)
+        params = endpoint.build_params(kwargs)
+        data = self.make_request(endpoint=endpoint.path, params=params,
+                                 cache_ttl=kwargs.get('cache_ttl',
+                                                      endpoint.cache_ttl))
+        if data is not None and not isinstance(data, endpoint.response_type):
+            print(f"Error: Unexpected response from {endpoint.path} "
+                  f"(expected a {endpoint.response_type.__name__}).")
+            # Don't serve the bad payload from the cache next time
+            if self.cache is not None:
+                self.cache.discard(self.cache.make_key(endpoint.path, params))
+            return None
+        return data
+
+    def format_response(self, endpoint_type, data, *args, **kwargs):
+        """
+        Format a response with the formatter declared by its endpoint.
+
+        Args:
+            endpoint_type (str): Endpoint the data was fetched from
+            data: Raw JSON data from the API
+            *args, **kwargs: Passed to the formatter (e.g. driver_name)
+
+        Returns:
+            str: Formatted string for console output
+        """
+        endpoint = self.ENDPOINTS.get(endpoint_type)
+        if endpoint is None or endpoint.formatter is None:
+            return self.format_output(data)
+        return getattr(self, endpoint.formatter)(data, *args, **kwargs)
 
     def format_output(self, data):
         """
@@ -229,14 +256,14 @@ class F1API(APIBase):
         output.append("=" * 80)
         return "\n".join(output)
 
-    def format_race_results(self, data, driver_name="Driver"):
+    def format_race_results(self, data, driver_name="Driver", year="2024"):
         """Format race results for display."""
         if not data:
             return "No race results available."
 
         output = []
         output.append("=" * 80)
-        output.append(f"2024 RACE RESULTS - {driver_name}".center(80))
+        output.append(f"{year} RACE RESULTS - {driver_name}".center(80))
         output.append("=" * 80)
         output.append("")
         output.append(
@@ -245,25 +272,28 @@ class F1API(APIBase):
 
         total_points = 0
         for race in data:
-            date = race.get('date', 'N/A')
-            race_name = race.get('race', 'Unknown Race')
-            place = race.get('place', 'N/A')
-            start = race.get('start', 'N/A')
-            points = race.get('points', 0)
-            total_points += points
-
-            # Truncate race name if too long
-            if len(race_name) > 38:
-                race_name = race_name[:35] + "..."
-
-            output.append(
-                f"{date:<10} {race_name:<40} {place:<5} {start:<7} {points:<5}")
+            total_points += race.get('points', 0)
+            output.append(self._race_result_row(race))
 
         output.append("-" * 80)
-        output.append(f"Total Points (2024): {total_points}")
+        output.append(f"Total Points ({year}): {total_points}")
         output.append("=" * 80)
         return "\n".join(output)
 
+    def _race_result_row(self, race):
+        """Format a single race result as a table row."""
+        date = race.get('date', 'N/A')
+        race_name = race.get('race', 'Unknown Race')
+        place = race.get('place', 'N/A')
+        start = race.get('start', 'N/A')
+        points = race.get('points', 0)
+
+        # Truncate race name if too long
+        if len(race_name) > 38:
+            race_name = race_name[:35] + "..."
+
+        return f"{date:<10} {race_name:<40} {place:<5} {start:<7} {points:<5}"
+
     def format_career_stats(self, data, driver_name="Driver"):
         """Format career statistics for display."""
         if not data:
@@ -283,21 +313,10 @@ class F1API(APIBase):
         total_points = 0
 
         for season in data:
-            year = season.get('year', 'N/A')
-            rank = season.get('rank', 'N/A')
-            starts = season.get('starts', 0)
-            wins = season.get('wins', 0)
-            poles = season.get('poles', 0)
-            top5 = season.get('top5', 0)
-            top10 = season.get('top10', 0)
-            points = season.get('points', 0)
-
-            total_wins += wins
-            total_poles += poles
-            total_points += points
-
-            output.append(
-                f"{year:<6} {rank:<6} {starts:<8} {wins:<6} {poles:<7} {top5:<7} {top10:<7} {points:<8}")
+            total_wins += season.get('wins', 0)
+            total_poles += season.get('poles', 0)
+            total_points += season.get('points', 0)
+            output.append(self._career_stats_row(season))
 
         output.append("-" * 80)
         output.append(
@@ -305,6 +324,81 @@ class F1API(APIBase):
         output.append("=" * 80)
         return "\n".join(output)
 
+    def _career_stats_row(self, season):
+        """Format a single season of career statistics as a table row."""
+        year = season.get('year', 'N/A')
+        rank = season.get('rank', 'N/A')
+        starts = season.get('starts', 0)
+        wins = season.get('wins', 0)
+        poles = season.get('poles', 0)
+        top5 = season.get('top5', 0)
+        top10 = season.get('top10', 0)
+        points = season.get('points', 0)
+
+        return f"{year:<6} {rank:<6} {starts:<8} {wins:<6} {poles:<7} {top5:<7} {top10:<7} {points:<8}"
+
+    def format_changes(self, changes, driver_name="Driver"):
+        """
+        Format only the records that changed since the previous fetch.
+
+        Args:
+            changes (ChangeSet): Result of DiffEngine.update()
+            driver_name (str): Driver name for the title
+
+        Returns:
+            str: Formatted string for console output
+        """
+        if not changes:
+            return "No changes since the last update."
+
+        if changes.endpoint_type == 'race-results':
+            title = f"RACE RESULT UPDATES - {driver_name}"
+            header = f"  {'Date':<10} {'Race':<40} {'Pos':<5} {'Start':<7} {'Pts':<5}"
+            row = self._race_result_row
+        elif changes.endpoint_type == 'stats':
+            title = f"CAREER STATISTICS UPDATES - {driver_name}"
+            header = f"  {'Year':<6} {'Rank':<6} {'Starts':<8} {'Wins':<6} {'Poles':<7} {'Top5':<7} {'Top10':<7} {'Points':<8}"
+            row = self._career_stats_row
+        else:
+            title = f"{changes.endpoint_type.upper()} UPDATES"
+            header = None
+            row = None
+
+        output = []
+        output.append("=" * 80)
+        output.append(title.center(80))
+        output.append("=" * 80)
+        if header:
+            output.append(header)
+            output.append("-" * 80)
+
+        sections = [
+            ("+", changes.added.items()),
+            ("~", [(key, new) for key, (old, new) in changes.changed.items()]),
+            ("-", changes.removed.items()),
+        ]
+        for marker, records in sections:
+            for key, record in records:
+                line = row(record) if row else f"{key}: {record}"
+                output.append(f"{marker} {line}")
+
+        points_delta = self._points_delta(changes)
+        if points_delta:
+            output.append("-" * 80)
+            output.append(f"Points change: {points_delta:+}")
+        output.append("=" * 80)
+        return "\n".join(output)
+
+    def _points_delta(self, changes):
+        """Return the net change in points described by a change set."""
+        if changes.endpoint_type not in ('race-results', 'stats'):
+            return 0
+        delta = sum(r.get('points', 0) for r in changes.added.values())
+        delta -= sum(r.get('points', 0) for r in changes.removed.values())
+        for old, new in changes.changed.values():
+            delta += new.get('points', 0) - old.get('points', 0)
+        return delta
+
     def display_menu(self):
         """Display the main menu options."""
         print("\n" + "=" * 60)
@@ -312,7 +406,8 @@ class F1API(APIBase):
         print("=" * 60)
         print("\n1. View Race Report by Event ID")
         print("2. View Driver Statistics (2024 Grid)")
-        print("3. Exit")
+        print("3. Compare Drivers")
+        print("4. Exit")
         print("=" * 60)
 
     def display_driver_menu(self):
@@ -332,10 +427,10 @@ class F1API(APIBase):
     def get_user_choice(self):
         """Get user's menu choice."""
         print("\nPlease select an option:")
-        user_choice = input("\nEnter your choice (1-3): ").strip()
-        while user_choice not in ['1', '2', '3']:
-            print("Invalid choice. Please enter 1, 2, or 3.")
-            user_choice = input("\nEnter your choice (1-3): ").strip()
+        user_choice = input("\nEnter your choice (1-4): ").strip()
+        while user_choice not in ['1', '2', '3', '4']:
+            print("Invalid choice. Please enter 1, 2, 3, or 4.")
+            user_choice = input("\nEnter your choice (1-4): ").strip()
         return user_choice
 
     def get_driver_choice(self):
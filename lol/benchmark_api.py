@@ -0,0 +1,298 @@
+"""
+Performance regression benchmarks for the F1 Race Report & Driver Stats Viewer.
+
+Runs offline against the JSON fixtures in fixtures/ served by a local stub
+server, compares every timing with the stored baseline, and exits with
+status 1 if any benchmark got slower than the allowed threshold.
+
+Usage:
+    python benchmark_api.py                  # run and compare with baseline
+    python benchmark_api.py --save           # run and store a new baseline
+    python benchmark_api.py --threshold 0.5  # allow 50% slowdown
+    python benchmark_api.py --record         # refresh fixtures from the live API
+    python benchmark_api.py --hedging        # p50/p99 with and without hedging
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+from api_f1 import F1API
+from grid_workers import GridReportBuilder
+from response_cache import ResponseCache
+from stub_server import StubServer
+
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+FIXTURES_DIR = os.path.join(HERE, "fixtures")
+BASELINE_FILE = os.path.join(HERE, "benchmark_baseline.json")
+
+# Driver used for every single-driver fixture
+FIXTURE_PARAMS = {
+    "race-report": {"eventId": "600041134"},
+    "athlete-info": {"athleteId": "4665"},
+    "race-results": {"driverId": "4665", "year": "2024"},
+    "stats": {"driverId": "4665"},
+}
+
+
+def load_fixtures():
+    """
+    Load the recorded responses.
+
+    Returns:
+        dict: Raw JSON text keyed by endpoint_type
+    """
+    fixtures = {}
+    for endpoint_type in FIXTURE_PARAMS:
+        with open(os.path.join(FIXTURES_DIR, f"{endpoint_type}.json")) as f:
+            fixtures[endpoint_type] = f.read()
+    return fixtures
+
+
+def record_fixtures():
+    """Fetch every fixture from the live API and save it to fixtures/."""
+    f1_api = F1API()
+    for endpoint_type, params in FIXTURE_PARAMS.items():
+        print(f" Recording {endpoint_type}...")
+        data = f1_api.fetch_data(endpoint_type=endpoint_type, **params)
+        if data is None:
+            print(f" Failed to record {endpoint_type}; keeping the old fixture.")
+            continue
+        with open(os.path.join(FIXTURES_DIR, f"{endpoint_type}.json"), "w") as f:
+            json.dump(data, f, indent=2)
+
+
+def offline_api(base_url, cache=None):
+    """Create an F1API pointed at the stub server."""
+    f1_api = F1API()
+    f1_api.base_url = base_url
+    f1_api.cache = cache
+    return f1_api
+
+
+def measure(func, rounds=7, min_time=0.1):
+    """
+    Time a function.
+
+    Args:
+        func (callable): Function to call with no arguments
+        rounds (int): Rounds to run; the fastest is kept to reduce noise
+        min_time (float): Minimum seconds per round; the number of calls
+            per round is raised until a round takes at least this long
+
+    Returns:
+        float: Seconds per call in the fastest round
+    """
+    number = 1
+    while True:
+        started = time.perf_counter()
+        for _ in range(number):
+            func()
+        elapsed = time.perf_counter() - started
+        if elapsed >= min_time:
+            break
+        number *= 2
+
+    best = elapsed / number
+    for _ in range(rounds - 1):
+        started = time.perf_counter()
+        for _ in range(number):
+            func()
+        best = min(best, (time.perf_counter() - started) / number)
+    return best
+
+
+def run_benchmarks(rounds=7):
+    """
+    Run every benchmark.
+
+    Returns:
+        dict: Seconds per operation keyed by benchmark name
+    """
+    fixtures = load_fixtures()
+    data = {name: json.loads(text) for name, text in fixtures.items()}
+    payloads = {F1API.ENDPOINTS.get(name).path: value
+                for name, value in data.items()}
+    formatter = F1API()
+    results = {}
+
+    for name, text in fixtures.items():
+        results[f"json_decode[{name}]"] = measure(
+            lambda text=text: json.loads(text), rounds)
+
+    results["format_output"] = measure(
+        lambda: formatter.format_output(data["race-report"]), rounds)
+    results["format_athlete_info"] = measure(
+        lambda: formatter.format_athlete_info(data["athlete-info"]), rounds)
+    results["format_race_results"] = measure(
+        lambda: formatter.format_race_results(data["race-results"],
+                                              "Max Verstappen"), rounds)
+    results["format_career_stats"] = measure(
+        lambda: formatter.format_career_stats(data["stats"],
+                                              "Max Verstappen"), rounds)
+
+    with StubServer(payloads=payloads) as stub:
+        f1_api = offline_api(stub.base_url)
+        results["make_request[stats]"] = measure(
+            lambda: f1_api.fetch_data(endpoint_type="stats",
+                                      driverId="4665"), rounds)
+
+        cached_api = offline_api(stub.base_url, ResponseCache())
+        cached_api.fetch_data(endpoint_type="stats", driverId="4665")
+        results["cache_hit[stats]"] = measure(
+            lambda: cached_api.fetch_data(endpoint_type="stats",
+                                          driverId="4665"), rounds)
+
+        builder = GridReportBuilder(offline_api(stub.base_url), workers=1)
+        results["grid_fetch_and_render"] = measure(
+            lambda: builder.build_report(seasons=["2024"]), rounds)
+
+    return results
+
+
+def benchmark_hedging(requests_per_endpoint=1000, seed=7):
+    """
+    Measure p50/p99 latency of athlete-info and stats against a jittery
+    local stub server, with and without hedged requests.
+
+    Returns:
+        list: (endpoint, mode, p50 ms, p99 ms, hedges sent) tuples
+    """
+    results = []
+    with StubServer(latency=(0.005, 0.015), slow_probability=0.02,
+                    slow_latency=0.25, seed=seed) as stub:
+        for hedge in (False, True):
+            f1_api = offline_api(stub.base_url)
+            f1_api.hedge_requests = hedge
+            for endpoint_type, params in (('athlete-info', {'athleteId': '4665'}),
+                                          ('stats', {'driverId': '4665'})):
+                hedges_before = f1_api.hedges_sent
+                timings = []
+                for _ in range(requests_per_endpoint):
+                    started = time.perf_counter()
+                    f1_api.fetch_data(endpoint_type=endpoint_type, **params)
+                    timings.append(time.perf_counter() - started)
+                timings.sort()
+                results.append((
+                    endpoint_type, "hedged" if hedge else "single",
+                    timings[len(timings) // 2] * 1000,
+                    timings[int(len(timings) * 0.99)] * 1000,
+                    f1_api.hedges_sent - hedges_before))
+    return results
+
+
+def format_hedging_report(results):
+    """Format benchmark_hedging() results for console display."""
+    output = []
+    output.append(
+        f"{'Endpoint':<14} {'Mode':<8} {'p50 (ms)':<10} {'p99 (ms)':<10} {'Hedges':<8}")
+    output.append("-" * 52)
+    for endpoint, mode, p50, p99, hedges in results:
+        output.append(
+            f"{endpoint:<14} {mode:<8} {p50:<10.1f} {p99:<10.1f} {hedges:<8}")
+    return "\n".join(output)
+
+
+def load_baseline(path=BASELINE_FILE):
+    """Return the stored baseline, or an empty dict if there is none."""
+    try:
+        with open(path) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def save_baseline(results, path=BASELINE_FILE):
+    """Store benchmark results as the new baseline."""
+    with open(path, "w") as f:
+        json.dump(results, f, indent=2, sort_keys=True)
+
+
+def compare(results, baseline, threshold):
+    """
+    Compare results with a baseline.
+
+    Args:
+        results (dict): Output of run_benchmarks()
+        baseline (dict): Previously saved results
+        threshold (float): Allowed slowdown (0.25 = 25% slower)
+
+    Returns:
+        list: (name, baseline s, current s, change, regressed) tuples
+    """
+    rows = []
+    for name, current in results.items():
+        previous = baseline.get(name)
+        if previous is None:
+            rows.append((name, None, current, None, False))
+            continue
+        change = current / previous - 1
+        rows.append((name, previous, current, change, change > threshold))
+    return rows
+
+
+def format_report(rows, threshold):
+    """Format a comparison table for console display."""
+    output = []
+    output.append("=" * 80)
+    output.append("PERFORMANCE BENCHMARKS".center(80))
+    output.append("=" * 80)
+    output.append(
+        f"{'Benchmark':<34} {'Baseline (µs)':>14} {'Current (µs)':>14} {'Change':>9}  ")
+    output.append("-" * 80)
+    for name, previous, current, change, regressed in rows:
+        previous_text = "-" if previous is None else f"{previous * 1e6:.1f}"
+        change_text = "new" if change is None else f"{change:+.0%}"
+        flag = "REGRESSED" if regressed else ""
+        output.append(
+            f"{name:<34} {previous_text:>14} {current * 1e6:>14.1f} {change_text:>9}  {flag}")
+    output.append("-" * 80)
+    regressions = sum(1 for row in rows if row[4])
+    if regressions:
+        output.append(
+            f"{regressions} benchmark(s) regressed by more than {threshold:.0%}.")
+    else:
+        output.append(f"No regressions beyond {threshold:.0%}.")
+    output.append("=" * 80)
+    return "\n".join(output)
+
+
+def main():
+    """Run the benchmarks from the command line."""
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--save", action="store_true",
+                        help="store the results as the new baseline")
+    parser.add_argument("--threshold", type=float, default=0.25,
+                        help="allowed slowdown before failing (default 0.25)")
+    parser.add_argument("--rounds", type=int, default=7,
+                        help="rounds per benchmark; the fastest is kept")
+    parser.add_argument("--baseline", default=BASELINE_FILE,
+                        help="baseline file to compare with or save to")
+    parser.add_argument("--record", action="store_true",
+                        help="refresh fixtures from the live API and exit")
+    parser.add_argument("--hedging", action="store_true",
+                        help="compare latency with and without hedged requests and exit")
+    args = parser.parse_args()
+
+    if args.record:
+        record_fixtures()
+        return 0
+    if args.hedging:
+        print(format_hedging_report(benchmark_hedging()))
+        return 0
+
+    results = run_benchmarks(args.rounds)
+    rows = compare(results, load_baseline(args.baseline), args.threshold)
+    print(format_report(rows, args.threshold))
+
+    if args.save:
+        save_baseline(results, args.baseline)
+        print(f"\nBaseline saved to {args.baseline}")
+        return 0
+    return 1 if any(row[4] for row in rows) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
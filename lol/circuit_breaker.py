@@ -0,0 +1,108 @@
+import threading
+import time
+
+
+class CircuitBreaker:
+    """
+    Stops network attempts after repeated connection failures.
+
+    closed:    requests go through normally
+    open:      requests are refused until reset_timeout has passed
+    half_open: a single probe request is let through; success closes
+               the circuit, failure opens it again
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(self, failure_threshold=3, reset_timeout=30):
+        """
+        Initialize the circuit breaker.
+
+        Args:
+            failure_threshold (int): Consecutive failures that open the circuit
+            reset_timeout (float): Seconds to wait before probing again
+        """
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.state = self.CLOSED
+        self.failures = 0
+        self.opened_at = None
+        self._probe_in_flight = False
+        self._probe_thread = None
+        self._lock = threading.Lock()
+
+    def allow_request(self, now=None):
+        """
+        Check whether a network request may be attempted.
+
+        Args:
+            now (float): time.monotonic() value to use (mainly for testing)
+
+        Returns:
+            bool: True if the request should be sent
+        """
+        now = time.monotonic() if now is None else now
+        with self._lock:
+            if self.state == self.CLOSED:
+                return True
+            if self.state == self.OPEN:
+                if now - self.opened_at < self.reset_timeout:
+                    return False
+                self.state = self.HALF_OPEN
+                self._probe_in_flight = False
+            if self._probe_in_flight:
+                return False
+            self._probe_in_flight = True
+            self._probe_thread = threading.get_ident()
+            return True
+
+    def ready(self, now=None):
+        """
+        Check, without taking the probe slot, whether allow_request()
+        would currently let a request through.
+        """
+        now = time.monotonic() if now is None else now
+        with self._lock:
+            if self.state == self.CLOSED:
+                return True
+            if self.state == self.OPEN:
+                return now - self.opened_at >= self.reset_timeout
+            return not self._probe_in_flight
+
+    def release(self):
+        """
+        Give back a probe slot taken by this thread without recording an
+        outcome, e.g. when the request was never sent or failed for a
+        reason that says nothing about the network.
+        """
+        with self._lock:
+            if self._probe_in_flight and \
+                    self._probe_thread == threading.get_ident():
+                self._probe_in_flight = False
+                self._probe_thread = None
+
+    def record_success(self):
+        """Record that the network answered; closes the circuit."""
+        with self._lock:
+            self.state = self.CLOSED
+            self.failures = 0
+            self.opened_at = None
+            self._probe_in_flight = False
+
+    def record_failure(self, now=None):
+        """Record a connection failure or timeout."""
+        now = time.monotonic() if now is None else now
+        with self._lock:
+            self.failures += 1
+            self._probe_in_flight = False
+            if (self.state == self.HALF_OPEN
+                    or self.failures >= self.failure_threshold):
+                self.state = self.OPEN
+                self.opened_at = now
+
+    @property
+    def is_open(self):
+        """True while network requests are being refused."""
+        return self.state != self.CLOSED
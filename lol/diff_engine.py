@@ -0,0 +1,181 @@
+from endpoints import F1_ENDPOINTS
+
+
+class ChangeSet:
+    """
+    Differences between two versions of the same API response.
+    Records are indexed by their stable key (see Endpoint.key_fields).
+    """
+
+    def __init__(self, endpoint_type, params=None):
+        """
+        Initialize an empty change set.
+
+        Args:
+            endpoint_type (str): F1API endpoint type the records came from
+            params (dict): Parameters the response was fetched with
+        """
+        self.endpoint_type = endpoint_type
+        self.params = dict(params or {})
+        self.added = {}
+        self.changed = {}
+        self.removed = {}
+
+    def __bool__(self):
+        return bool(self.added or self.changed or self.removed)
+
+    def __len__(self):
+        return len(self.added) + len(self.changed) + len(self.removed)
+
+    def __repr__(self):
+        return (f"ChangeSet({self.endpoint_type}: +{len(self.added)} "
+                f"~{len(self.changed)} -{len(self.removed)})")
+
+    def new_records(self):
+        """Return the added and changed records in their new form."""
+        records = list(self.added.values())
+        records.extend(new for old, new in self.changed.values())
+        return records
+
+
+class DiffEngine:
+    """
+    Structural diffing of repeated API responses.
+
+    Keeps the previous version of every response it has seen and, on
+    refresh, reports only the records that were added, changed or
+    removed so consumers can update incrementally.
+    """
+
+    def __init__(self, endpoints=None):
+        """
+        Initialize the engine with no cached responses.
+
+        Args:
+            endpoints (EndpointRegistry): Source of each list endpoint's
+                key_fields (defaults to the F1 endpoints). Dict responses
+                are keyed by their top-level keys.
+        """
+        self.endpoints = endpoints or F1_ENDPOINTS
+        self.previous = {}
+        self.listeners = []
+
+    def add_listener(self, listener):
+        """
+        Register a consumer for non-empty change sets.
+
+        Args:
+            listener (callable): Called as listener(changes)
+        """
+        self.listeners.append(listener)
+
+    def remove_listener(self, listener):
+        """Unregister a consumer added with add_listener()."""
+        if listener in self.listeners:
+            self.listeners.remove(listener)
+
+    def index(self, endpoint_type, data):
+        """
+        Index a response by stable record keys.
+
+        Args:
+            endpoint_type (str): F1API endpoint type
+            data: Raw JSON data from the API
+
+        Returns:
+            dict: Mapping of record key to record
+        """
+        if data is None:
+            return {}
+        if isinstance(data, dict):
+            return dict(data)
+
+        endpoint = self.endpoints.get(endpoint_type)
+        fields = endpoint.key_fields if endpoint else None
+        indexed = {}
+        occurrences = {}
+        for position, record in enumerate(data):
+            if fields and isinstance(record, dict):
+                key = tuple(record.get(field) for field in fields)
+            else:
+                key = (position,)
+            # Number repeated keys by occurrence (not position), so a row
+            # inserted elsewhere doesn't re-key every later duplicate
+            count = occurrences.get(key, 0)
+            occurrences[key] = count + 1
+            if count:
+                key = key + (count,)
+            indexed[key] = record
+        return indexed
+
+    def compare(self, endpoint_type, old_index, new_index, params=None):
+        """
+        Compare two indexed versions of a response.
+
+        Args:
+            endpoint_type (str): F1API endpoint type
+            old_index (dict): Previous version from index()
+            new_index (dict): New version from index()
+            params (dict): Parameters the response was fetched with
+
+        Returns:
+            ChangeSet: The records that were added, changed or removed
+        """
+        changes = ChangeSet(endpoint_type, params)
+        for key, record in new_index.items():
+            if key not in old_index:
+                changes.added[key] = record
+            elif old_index[key] != record:
+                changes.changed[key] = (old_index[key], record)
+        for key, record in old_index.items():
+            if key not in new_index:
+                changes.removed[key] = record
+        return changes
+
+    def diff(self, endpoint_type, old, new):
+        """
+        Compare two raw responses without touching the cache.
+
+        Args:
+            endpoint_type (str): F1API endpoint type
+            old: Previous response (None if there is none)
+            new: New response
+
+        Returns:
+            ChangeSet: The records that were added, changed or removed
+        """
+        return self.compare(endpoint_type, self.index(endpoint_type, old),
+                            self.index(endpoint_type, new))
+
+    def update(self, endpoint_type, params, data):
+        """
+        Compare a new response to the cached previous version, replace
+        the cached version, and notify listeners if anything changed.
+
+        Args:
+            endpoint_type (str): F1API endpoint type
+            params (dict): Parameters the response was fetched with
+            data: New raw JSON data from the API
+
+        Returns:
+            ChangeSet: The records that were added, changed or removed
+        """
+        cache_key = (endpoint_type, tuple(sorted((params or {}).items())))
+        new_index = self.index(endpoint_type, data)
+        changes = self.compare(endpoint_type,
+                               self.previous.get(cache_key, {}),
+                               new_index, params)
+        self.previous[cache_key] = new_index
+
+        if changes:
+            for listener in list(self.listeners):
+                try:
+                    listener(changes)
+                except Exception as e:
+                    print(f"Error: Change listener failed: {e}")
+        return changes
+
+    def forget(self, endpoint_type, params):
+        """Drop the cached version of a response."""
+        cache_key = (endpoint_type, tuple(sorted((params or {}).items())))
+        self.previous.pop(cache_key, None)
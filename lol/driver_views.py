@@ -0,0 +1,320 @@
+import threading
+from bisect import bisect_left, insort
+from diff_engine import DiffEngine
+
+
+class DriverViews:
+    """
+    Materialized views over fetched driver data.
+
+    Maintains season leaderboards, teammate head-to-heads and career
+    totals. Views are updated incrementally from DiffEngine change sets,
+    so only changed race rows or seasons are reprocessed and every
+    comparison query is a dictionary lookup. Updates and queries are
+    serialized by a lock, so change sets may arrive from several threads.
+    """
+
+    def __init__(self, drivers, diff_engine=None):
+        """
+        Initialize empty views.
+
+        Args:
+            drivers (dict): Driver grid such as F1API.DRIVERS_2024; team
+                pairings for head-to-heads are taken from it
+            diff_engine (DiffEngine): Engine to listen to (a new one is
+                created if omitted); share the poller's to follow live data,
+                since apply() is safe to call from its worker threads
+        """
+        self.drivers = {d['id']: d for d in drivers.values()}
+        self.teammates = {}
+        teams = {}
+        for driver in self.drivers.values():
+            teams.setdefault(driver['team'], []).append(driver['id'])
+        for members in teams.values():
+            for driver_id in members:
+                self.teammates[driver_id] = [m for m in members
+                                             if m != driver_id]
+
+        # Source rows: (driver_id, year) -> {race key: row}
+        self._results = {}
+        # Views
+        self.season_totals = {}     # year -> driver_id -> totals
+        self.head_to_head = {}      # (year, id_a, id_b) -> {id: races ahead}
+        self.career_totals = {}     # driver_id -> totals
+        self._leaderboards = {}     # year -> sorted [(-points, name, id)]
+        self._lock = threading.RLock()
+
+        self.diff_engine = diff_engine or DiffEngine()
+        self.diff_engine.add_listener(self.apply)
+
+    def update(self, endpoint_type, params, data):
+        """
+        Feed a fetched response into the views.
+
+        Args:
+            endpoint_type (str): 'race-results' or 'stats'
+            params (dict): Parameters the response was fetched with
+                (must include driverId, and year for race-results)
+            data: Raw JSON data from the API
+
+        Returns:
+            ChangeSet: What changed since the previous version
+        """
+        return self.diff_engine.update(endpoint_type, params, data)
+
+    def apply(self, changes):
+        """
+        Apply a ChangeSet to the views (DiffEngine listener).
+
+        Args:
+            changes (ChangeSet): Changes from DiffEngine.update()
+        """
+        driver_id = str(changes.params.get('driverId'))
+        if driver_id not in self.drivers:
+            return
+
+        with self._lock:
+            self._apply(driver_id, changes)
+
+    def _apply(self, driver_id, changes):
+        """Apply a ChangeSet for one driver; the caller holds the lock."""
+        if changes.endpoint_type == 'race-results':
+            year = str(changes.params.get('year', '2024'))
+            for key, row in changes.added.items():
+                self._set_race(driver_id, year, key, row)
+            for key, (old, new) in changes.changed.items():
+                self._set_race(driver_id, year, key, new)
+            for key in changes.removed:
+                self._set_race(driver_id, year, key, None)
+        elif changes.endpoint_type == 'stats':
+            for key, row in changes.added.items():
+                self._add_season(driver_id, row, 1)
+            for key, (old, new) in changes.changed.items():
+                self._add_season(driver_id, old, -1)
+                self._add_season(driver_id, new, 1)
+            for key, row in changes.removed.items():
+                self._add_season(driver_id, row, -1)
+
+    @staticmethod
+    def _place(row):
+        """Return a finishing position as an int, or None if not classified."""
+        place = row.get('place') if row else None
+        return int(place) if str(place).isdigit() else None
+
+    def _set_race(self, driver_id, year, key, row):
+        """Replace one race row, adjusting season totals and head-to-heads."""
+        rows = self._results.setdefault((driver_id, year), {})
+        old = rows.get(key)
+
+        for teammate in self.teammates[driver_id]:
+            other = self._results.get((teammate, year), {}).get(key)
+            self._add_battle(year, driver_id, teammate, old, other, -1)
+            self._add_battle(year, driver_id, teammate, row, other, 1)
+
+        self._add_race(driver_id, year, old, -1)
+        self._add_race(driver_id, year, row, 1)
+        if row is None:
+            rows.pop(key, None)
+        else:
+            rows[key] = row
+
+    def _add_race(self, driver_id, year, row, sign):
+        """Add (sign=1) or remove (sign=-1) a race row from season totals."""
+        if row is None:
+            return
+        totals = self.season_totals.setdefault(year, {}).setdefault(
+            driver_id, {'points': 0, 'races': 0, 'wins': 0, 'podiums': 0})
+        old_points = totals['points']
+        place = self._place(row)
+        totals['points'] += sign * (row.get('points', 0) or 0)
+        totals['races'] += sign
+        totals['wins'] += sign * (place == 1)
+        totals['podiums'] += sign * (place is not None and place <= 3)
+        self._move_on_leaderboard(year, driver_id, old_points,
+                                  totals['points'])
+
+    def _move_on_leaderboard(self, year, driver_id, old_points, new_points):
+        """Keep the season leaderboard sorted after a points change."""
+        board = self._leaderboards.setdefault(year, [])
+        name = self.drivers[driver_id]['name']
+        old_entry = (-old_points, name, driver_id)
+        index = bisect_left(board, old_entry)
+        if index < len(board) and board[index] == old_entry:
+            board.pop(index)
+        insort(board, (-new_points, name, driver_id))
+
+    def _add_battle(self, year, driver_id, teammate, row, other, sign):
+        """Count which teammate finished ahead in one race."""
+        if row is None or other is None:
+            return
+        place, other_place = self._place(row), self._place(other)
+        if place is None and other_place is None:
+            return
+        if other_place is None or (place is not None and place < other_place):
+            winner = driver_id
+        elif place is None or other_place < place:
+            winner = teammate
+        else:
+            return
+        pair = (year,) + tuple(sorted((driver_id, teammate)))
+        battle = self.head_to_head.setdefault(
+            pair, {driver_id: 0, teammate: 0})
+        battle[winner] += sign
+
+    def _add_season(self, driver_id, row, sign):
+        """Add (sign=1) or remove (sign=-1) a season from career totals."""
+        totals = self.career_totals.setdefault(driver_id, {
+            'seasons': 0, 'starts': 0, 'wins': 0, 'poles': 0,
+            'top5': 0, 'top10': 0, 'points': 0, 'titles': 0})
+        totals['seasons'] += sign
+        for field in ('starts', 'wins', 'poles', 'top5', 'top10', 'points'):
+            totals[field] += sign * (row.get(field, 0) or 0)
+        totals['titles'] += sign * (str(row.get('rank')) == '1')
+
+    def leaderboard(self, year='2024'):
+        """
+        Return a season leaderboard.
+
+        Returns:
+            list: (driver_id, points) tuples, highest points first
+        """
+        with self._lock:
+            return [(driver_id, -points) for points, _, driver_id
+                    in self._leaderboards.get(str(year), [])]
+
+    def teammate_battle(self, driver_id, year='2024'):
+        """
+        Return a driver's head-to-head against their teammate.
+
+        Returns:
+            tuple: (teammate_id, driver races ahead, teammate races ahead),
+                or None if the driver has no teammate
+        """
+        teammates = self.teammates.get(driver_id)
+        if not teammates:
+            return None
+        teammate = teammates[0]
+        pair = (str(year),) + tuple(sorted((driver_id, teammate)))
+        with self._lock:
+            battle = dict(self.head_to_head.get(pair, {}))
+        return teammate, battle.get(driver_id, 0), battle.get(teammate, 0)
+
+    def compare(self, driver_a, driver_b, year='2024'):
+        """
+        Compare two drivers' season and career totals.
+
+        Returns:
+            dict: {'season': (totals a, totals b), 'career': (totals a, totals b)},
+                copied so later updates don't change them
+        """
+        with self._lock:
+            season = self.season_totals.get(str(year), {})
+            return {
+                'season': (dict(season.get(driver_a, {})),
+                           dict(season.get(driver_b, {}))),
+                'career': (dict(self.career_totals.get(driver_a, {})),
+                           dict(self.career_totals.get(driver_b, {}))),
+            }
+
+    def format_leaderboard(self, year='2024'):
+        """
+        Format a season leaderboard for display. Until every driver on
+        the grid has been loaded, the title says how many are ranked.
+        """
+        with self._lock:
+            board = self.leaderboard(year)
+            season = {driver_id: dict(totals) for driver_id, totals
+                      in self.season_totals.get(str(year), {}).items()}
+
+        title = f"{year} LEADERBOARD"
+        if len(board) < len(self.drivers):
+            title += f" ({len(board)} OF {len(self.drivers)} DRIVERS LOADED)"
+
+        output = []
+        output.append("=" * 80)
+        output.append(title.center(80))
+        output.append("=" * 80)
+        output.append("")
+        output.append(
+            f"{'Pos':<5} {'Driver':<25} {'Team':<20} {'Pts':<8} {'Wins':<6} {'Pod':<5}")
+        output.append("-" * 80)
+
+        for position, (driver_id, points) in enumerate(board, 1):
+            driver = self.drivers[driver_id]
+            totals = season[driver_id]
+            output.append(
+                f"{position:<5} {driver['name']:<25} {driver['team']:<20} "
+                f"{points:<8} {totals['wins']:<6} {totals['podiums']:<5}")
+
+        output.append("=" * 80)
+        return "\n".join(output)
+
+    def format_teammate_battles(self, year='2024'):
+        """Format every team's head-to-head for display."""
+        output = []
+        output.append("=" * 80)
+        output.append(f"{year} TEAMMATE HEAD-TO-HEADS".center(80))
+        output.append("=" * 80)
+        output.append("")
+
+        seen = set()
+        for driver_id, driver in self.drivers.items():
+            battle = self.teammate_battle(driver_id, year)
+            if battle is None or battle[0] in seen:
+                continue
+            seen.add(driver_id)
+            teammate, ahead, behind = battle
+            output.append(
+                f"{driver['team']:<20} {driver['name']:>22} {ahead:>3} - "
+                f"{behind:<3} {self.drivers[teammate]['name']}")
+
+        output.append("=" * 80)
+        return "\n".join(output)
+
+    def format_comparison(self, driver_a, driver_b, year='2024'):
+        """
+        Render two drivers side by side.
+
+        Args:
+            driver_a (str): First driver ID
+            driver_b (str): Second driver ID
+            year (str): Season for the season columns
+
+        Returns:
+            str: Formatted string for console output
+        """
+        name_a = self.drivers[driver_a]['name']
+        name_b = self.drivers[driver_b]['name']
+        comparison = self.compare(driver_a, driver_b, year)
+
+        output = []
+        output.append("=" * 80)
+        output.append(f"DRIVER COMPARISON - {name_a} vs {name_b}".center(80))
+        output.append("=" * 80)
+        output.append("")
+        output.append(f"{'':<22} {name_a:>25} {name_b:>25}")
+        output.append("-" * 80)
+
+        season_a, season_b = comparison['season']
+        output.append(f"{year} Season")
+        for field, label in (('points', 'Points'), ('wins', 'Wins'),
+                             ('podiums', 'Podiums'), ('races', 'Races')):
+            output.append(
+                f"  {label:<20} {season_a.get(field, '-'):>25} {season_b.get(field, '-'):>25}")
+
+        career_a, career_b = comparison['career']
+        output.append("Career")
+        for field, label in (('seasons', 'Seasons'), ('starts', 'Starts'),
+                             ('wins', 'Wins'), ('poles', 'Poles'),
+                             ('titles', 'Championships'), ('points', 'Points')):
+            output.append(
+                f"  {label:<20} {career_a.get(field, '-'):>25} {career_b.get(field, '-'):>25}")
+
+        if driver_b in self.teammates.get(driver_a, []):
+            _, ahead, behind = self.teammate_battle(driver_a, year)
+            output.append("-" * 80)
+            output.append(
+                f"  {'Head-to-head':<20} {ahead:>25} {behind:>25}")
+
+        output.append("=" * 80)
+        return "\n".join(output)
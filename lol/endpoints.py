@@ -0,0 +1,171 @@
+class Param:
+    """A query parameter accepted by an endpoint."""
+
+    def __init__(self, name, label, api_name=None, required=True,
+                 default=None, numeric=True):
+        """
+        Initialize a parameter definition.
+
+        Args:
+            name (str): Keyword argument name passed to fetch_data()
+            label (str): Human-readable name used in error messages
+            api_name (str): Query string name sent to the API (defaults to name)
+            required (bool): Whether the parameter must be supplied
+            default: Value used when the parameter is not supplied
+            numeric (bool): Whether the value must contain only digits
+        """
+        self.name = name
+        self.label = label
+        self.api_name = api_name or name
+        self.required = required
+        self.default = default
+        self.numeric = numeric
+
+    def validate(self, value):
+        """
+        Validate a supplied value.
+
+        Args:
+            value: Value passed by the caller (None if not supplied)
+
+        Returns:
+            bool: True if valid, False otherwise
+        """
+        if value is None:
+            if self.required and self.default is None:
+                print(f"Error: {self.label} is required.")
+                return False
+            return True
+        if value == "":
+            print(f"Error: {self.label} is required.")
+            return False
+        if self.numeric and not str(value).isdigit():
+            print(f"Invalid input. {self.label} should be numeric.")
+            return False
+        return True
+
+
+class Endpoint:
+    """Declarative description of one API endpoint."""
+
+    def __init__(self, name, path, params, cache_ttl=300, rate_cost=1,
+                 response_type=dict, key_fields=None, formatter=None):
+        """
+        Initialize an endpoint definition.
+
+        Args:
+            name (str): endpoint_type used to select the endpoint
+            path (str): URL path appended to the API base URL
+            params (list): Param definitions
+            cache_ttl (float): Seconds a cached response stays fresh
+            rate_cost (int): Rate-budget tokens one request costs
+            response_type (type): Expected JSON type (dict or list);
+                fetch_data() rejects responses of any other type
+            key_fields (tuple): Fields identifying a record in list responses
+            formatter (str): Name of the F1API method that formats responses
+        """
+        self.name = name
+        self.path = path
+        self.params = tuple(params)
+        self.cache_ttl = cache_ttl
+        self.rate_cost = rate_cost
+        self.response_type = response_type
+        self.key_fields = key_fields
+        self.formatter = formatter
+        # Precomputed (kwarg name, query name, default) triples
+        self._mapping = tuple((p.name, p.api_name, p.default)
+                              for p in self.params)
+
+    def __repr__(self):
+        return f"Endpoint({self.name}: {self.path})"
+
+    def build_params(self, kwargs):
+        """
+        Build the query parameters for a request.
+
+        Args:
+            kwargs (dict): Keyword arguments passed to fetch_data()
+
+        Returns:
+            dict: Query parameters to send
+        """
+        return {api_name: kwargs.get(name, default)
+                for name, api_name, default in self._mapping}
+
+    def validate(self, kwargs):
+        """
+        Validate every parameter of this endpoint.
+
+        Args:
+            kwargs (dict): Keyword arguments passed to fetch_data()
+
+        Returns:
+            bool: True if all parameters are valid, False otherwise
+        """
+        return all(param.validate(kwargs.get(param.name))
+                   for param in self.params)
+
+
+class EndpointRegistry:
+    """Lookup table of endpoint definitions keyed by endpoint_type."""
+
+    def __init__(self, endpoints=()):
+        """Initialize the registry with optional endpoint definitions."""
+        self._endpoints = {}
+        self._params = {}
+        for endpoint in endpoints:
+            self.register(endpoint)
+
+    def register(self, endpoint):
+        """
+        Add or replace an endpoint definition.
+
+        Args:
+            endpoint (Endpoint): Definition to register
+
+        Returns:
+            Endpoint: The registered definition
+        """
+        self._endpoints[endpoint.name] = endpoint
+        for param in endpoint.params:
+            self._params.setdefault(param.name, param)
+        return endpoint
+
+    def get(self, name):
+        """Return the endpoint for an endpoint_type, or None if unknown."""
+        return self._endpoints.get(name)
+
+    def param(self, name):
+        """Return the first registered Param with this keyword name, or None."""
+        return self._params.get(name)
+
+    def __contains__(self, name):
+        return name in self._endpoints
+
+    def __iter__(self):
+        return iter(self._endpoints.values())
+
+    def names(self):
+        """Return every registered endpoint_type."""
+        return list(self._endpoints)
+
+
+EVENT_ID = Param('eventId', 'Event ID')
+ATHLETE_ID = Param('athleteId', 'Driver ID')
+DRIVER_ID = Param('driverId', 'Driver ID')
+YEAR = Param('year', 'Year', required=False, default='2024')
+
+
+# F1 Motorsport Data API endpoints
+F1_ENDPOINTS = EndpointRegistry([
+    Endpoint('race-report', '/race-report', [EVENT_ID],
+             cache_ttl=3600, formatter='format_output'),
+    Endpoint('athlete-info', '/athlete-info', [ATHLETE_ID],
+             cache_ttl=86400, formatter='format_athlete_info'),
+    Endpoint('race-results', '/race-results', [DRIVER_ID, YEAR],
+             cache_ttl=300, response_type=list, key_fields=('date', 'race'),
+             formatter='format_race_results'),
+    Endpoint('stats', '/stats', [DRIVER_ID],
+             cache_ttl=3600, response_type=list, key_fields=('year',),
+             formatter='format_career_stats'),
+])
@@ -0,0 +1,346 @@
+"""
+Export fetched driver data to columnar files for downstream analytics.
+
+Race results, career statistics and driver information are streamed to
+Parquet (when pyarrow is installed) or CSV, one row group per batch so
+memory stays bounded no matter how many drivers and seasons are exported.
+Race results and statistics are partitioned by season:
+
+    <output>/race_results/season=2024/part-0.parquet
+    <output>/stats/season=2023/part-0.parquet
+    <output>/athlete_info/part-0.parquet
+"""
+
+import argparse
+import csv
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:
+    pa = None
+    pq = None
+
+
+# Column name and type for each exported dataset
+DATASETS = {
+    'race_results': [
+        ('driver_id', 'string'), ('driver_name', 'string'), ('team', 'string'),
+        ('season', 'int'), ('date', 'string'), ('race', 'string'),
+        ('place', 'string'), ('start', 'string'), ('points', 'float'),
+    ],
+    'stats': [
+        ('driver_id', 'string'), ('driver_name', 'string'), ('season', 'int'),
+        ('rank', 'string'), ('starts', 'int'), ('wins', 'int'),
+        ('poles', 'int'), ('top5', 'int'), ('top10', 'int'),
+        ('points', 'float'),
+    ],
+    'athlete_info': [
+        ('driver_id', 'string'), ('full_name', 'string'),
+        ('date_of_birth', 'string'), ('birth_city', 'string'),
+        ('team', 'string'), ('number', 'string'), ('manufacturer', 'string'),
+        ('chassis', 'string'), ('engine', 'string'), ('tire', 'string'),
+        ('link', 'string'),
+    ],
+}
+
+
+def _convert(value, kind):
+    """Coerce an API value to its column type (None stays None)."""
+    if value is None or value == "":
+        return None
+    try:
+        if kind == 'int':
+            return int(value)
+        if kind == 'float':
+            return float(value)
+    except (TypeError, ValueError):
+        return None
+    return str(value)
+
+
+class _CsvWriter:
+    """Appends batches of rows to a CSV file."""
+
+    extension = "csv"
+
+    def __init__(self, path, columns):
+        self.columns = [name for name, _ in columns]
+        self._file = open(path, "w", newline="")
+        self._writer = csv.writer(self._file)
+        self._writer.writerow(self.columns)
+
+    def write_batch(self, rows):
+        self._writer.writerows(
+            [row.get(name) for name in self.columns] for row in rows)
+
+    def close(self):
+        self._file.close()
+
+
+class _ParquetWriter:
+    """Writes each batch of rows as one Parquet row group."""
+
+    extension = "parquet"
+    TYPES = {'string': 'string', 'int': 'int64', 'float': 'float64'}
+
+    def __init__(self, path, columns):
+        self.columns = [name for name, _ in columns]
+        self.schema = pa.schema([(name, self.TYPES[kind])
+                                 for name, kind in columns])
+        self._writer = pq.ParquetWriter(path, self.schema)
+
+    def write_batch(self, rows):
+        table = pa.Table.from_pydict(
+            {name: [row.get(name) for row in rows] for name in self.columns},
+            schema=self.schema)
+        self._writer.write_table(table)
+
+    def close(self):
+        self._writer.close()
+
+
+class _PartitionedDataset:
+    """Buffers rows per partition and flushes them in fixed-size batches."""
+
+    def __init__(self, directory, columns, writer_class, batch_size,
+                 partition_key=None):
+        self.directory = directory
+        self.columns = columns
+        self.writer_class = writer_class
+        self.batch_size = batch_size
+        self.partition_key = partition_key
+        self.rows_written = 0
+        self._buffers = {}
+        self._writers = {}
+
+    def add(self, row):
+        partition = row.get(self.partition_key) if self.partition_key else None
+        buffer = self._buffers.setdefault(partition, [])
+        buffer.append(row)
+        if len(buffer) >= self.batch_size:
+            self._flush(partition)
+
+    def _flush(self, partition):
+        rows = self._buffers.get(partition)
+        if not rows:
+            return
+        writer = self._writers.get(partition)
+        if writer is None:
+            directory = self.directory
+            if self.partition_key:
+                directory = os.path.join(
+                    directory, f"{self.partition_key}={partition}")
+            os.makedirs(directory, exist_ok=True)
+            path = os.path.join(directory,
+                                f"part-0.{self.writer_class.extension}")
+            writer = self._writers[partition] = self.writer_class(
+                path, self.columns)
+        writer.write_batch(rows)
+        self.rows_written += len(rows)
+        self._buffers[partition] = []
+
+    def close(self):
+        for partition in list(self._buffers):
+            self._flush(partition)
+        for writer in self._writers.values():
+            writer.close()
+        return self.rows_written
+
+
+class DataExporter:
+    """
+    Streams race results, career statistics and driver information for
+    a set of drivers and seasons into columnar files.
+    """
+
+    def __init__(self, f1_api, output_dir, file_format=None, batch_size=1000,
+                 partition_by_season=True, fetch_threads=4):
+        """
+        Initialize the exporter.
+
+        Args:
+            f1_api (F1API): Configured API client (give it a cache so one
+                prefetch can feed several exports)
+            output_dir (str): Folder to write the datasets into
+            file_format (str): 'parquet' or 'csv' (defaults to parquet when
+                pyarrow is installed, otherwise csv)
+            batch_size (int): Rows buffered per partition before writing
+            partition_by_season (bool): Split race results and stats into
+                season=<year> folders
+            fetch_threads (int): Drivers fetched concurrently
+        """
+        if file_format is None:
+            file_format = "parquet" if pa is not None else "csv"
+        if file_format == "parquet" and pa is None:
+            raise ValueError(
+                "Error: Parquet export requires pyarrow. Install it or use CSV.")
+        if file_format not in ("parquet", "csv"):
+            raise ValueError(f"Error: Unsupported export format '{file_format}'.")
+
+        self.f1_api = f1_api
+        self.output_dir = output_dir
+        self.file_format = file_format
+        self.batch_size = batch_size
+        self.partition_by_season = partition_by_season
+        self.fetch_threads = fetch_threads
+
+    def _fetch_driver(self, driver, seasons, include_info):
+        """Fetch every response needed for one driver."""
+        driver_id = driver['id']
+        results = [(year, self.f1_api.fetch_data(
+            endpoint_type='race-results', driverId=driver_id, year=year))
+            for year in seasons]
+        stats = self.f1_api.fetch_data(endpoint_type='stats', driverId=driver_id)
+        info = None
+        if include_info:
+            info = self.f1_api.fetch_data(
+                endpoint_type='athlete-info', athleteId=driver_id)
+        return driver, results, stats, info
+
+    def _rows(self, driver, results, stats, info, seasons):
+        """Yield (dataset, row) pairs for one driver's responses."""
+        types = {name: dict(columns) for name, columns in DATASETS.items()}
+        base = {'driver_id': driver['id'], 'driver_name': driver['name']}
+
+        for year, races in results:
+            for race in races or []:
+                row = dict(base, team=driver['team'], season=year, **{
+                    field: race.get(field)
+                    for field in ('date', 'race', 'place', 'start', 'points')})
+                yield 'race_results', {k: _convert(v, types['race_results'][k])
+                                       for k, v in row.items()}
+
+        season_set = {int(year) for year in seasons}
+        for season in stats or []:
+            if _convert(season.get('year'), 'int') not in season_set:
+                continue
+            row = dict(base, season=season.get('year'), **{
+                field: season.get(field)
+                for field in ('rank', 'starts', 'wins', 'poles', 'top5',
+                              'top10', 'points')})
+            yield 'stats', {k: _convert(v, types['stats'][k])
+                            for k, v in row.items()}
+
+        if info:
+            vehicle = (info.get('vehicles') or [{}])[0]
+            row = {
+                'driver_id': driver['id'],
+                'full_name': info.get('fullName'),
+                'date_of_birth': info.get('dateOfBirth'),
+                'birth_city': (info.get('birthPlace') or {}).get('city'),
+                'link': info.get('link'),
+            }
+            for field in ('team', 'number', 'manufacturer', 'chassis',
+                          'engine', 'tire'):
+                row[field] = vehicle.get(field)
+            yield 'athlete_info', {k: _convert(v, types['athlete_info'][k])
+                                   for k, v in row.items()}
+
+    def export(self, drivers=None, seasons=('2024',), include_info=True):
+        """
+        Fetch and export data for a driver set and season range.
+
+        Args:
+            drivers (list): Driver dicts (defaults to F1API.DRIVERS_2024)
+            seasons (iterable): Season years for race results and stats
+            include_info (bool): Also export driver information
+
+        Returns:
+            dict: Rows written per dataset
+        """
+        if drivers is None:
+            drivers = self.f1_api.DRIVERS_2024.values()
+        drivers = list(drivers)
+        seasons = [str(year) for year in seasons]
+        writer_class = _ParquetWriter if self.file_format == "parquet" \
+            else _CsvWriter
+        partition_key = 'season' if self.partition_by_season else None
+
+        datasets = {
+            name: _PartitionedDataset(
+                os.path.join(self.output_dir, name), columns, writer_class,
+                self.batch_size,
+                partition_key if name != 'athlete_info' else None)
+            for name, columns in DATASETS.items()
+        }
+
+        try:
+            with ThreadPoolExecutor(self.fetch_threads) as executor:
+                # Fetch a window of drivers at a time so only that many
+                # drivers' responses are held in memory
+                for start in range(0, len(drivers), self.fetch_threads):
+                    window = drivers[start:start + self.fetch_threads]
+                    fetched = executor.map(
+                        lambda d: self._fetch_driver(d, seasons, include_info),
+                        window)
+                    for driver, results, stats, info in fetched:
+                        for name, row in self._rows(driver, results, stats,
+                                                    info, seasons):
+                            datasets[name].add(row)
+        finally:
+            written = {name: dataset.close()
+                       for name, dataset in datasets.items()}
+        return written
+
+
+def main():
+    """Export data from the command line."""
+    from api_f1 import F1API
+    from main import CACHE_DIR
+    from response_cache import ResponseCache
+
+    parser = argparse.ArgumentParser(
+        description="Export F1 driver data to Parquet or CSV.")
+    parser.add_argument("output", help="folder to write the datasets into")
+    parser.add_argument("--from-season", type=int, default=2024)
+    parser.add_argument("--to-season", type=int, default=2024)
+    parser.add_argument("--drivers", nargs="*",
+                        help="driver IDs (default: the 2024 grid)")
+    parser.add_argument("--format", choices=("parquet", "csv"),
+                        help="file format (default: parquet if available)")
+    parser.add_argument("--no-partition", action="store_true",
+                        help="don't split race results and stats by season")
+    parser.add_argument("--cache-dir", default=CACHE_DIR,
+                        help="response cache folder (default: the one "
+                             "main.py uses)")
+    args = parser.parse_args()
+
+    f1_api = F1API()
+    # Share main.py's disk cache so repeat exports don't re-spend quota
+    f1_api.cache = ResponseCache(directory=args.cache_dir)
+    drivers = list(f1_api.DRIVERS_2024.values())
+    if args.drivers is not None:
+        known = {d['id'] for d in drivers}
+        unknown = [driver_id for driver_id in args.drivers
+                   if driver_id not in known]
+        if not args.drivers:
+            print("\nError: --drivers needs at least one driver ID.")
+            return
+        if unknown:
+            print(f"\nError: Unknown driver ID(s): {', '.join(unknown)}. "
+                  "Valid IDs:")
+            for driver in drivers:
+                print(f"  {driver['id']:<6} {driver['name']}")
+            return
+        drivers = [d for d in drivers if d['id'] in args.drivers]
+
+    try:
+        exporter = DataExporter(f1_api, args.output, args.format,
+                                partition_by_season=not args.no_partition)
+    except ValueError as e:
+        print(f"\n{e}")
+        return
+
+    seasons = range(args.from_season, args.to_season + 1)
+    print(f"\n Exporting {len(drivers)} driver(s), seasons "
+          f"{args.from_season}-{args.to_season} as {exporter.file_format}...")
+    written = exporter.export(drivers, seasons)
+    for name, rows in written.items():
+        print(f"  {name:<14} {rows} rows")
+
+
+if __name__ == "__main__":
+    main()
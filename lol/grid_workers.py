@@ -0,0 +1,288 @@
+"""
+Multi-process worker mode for grid-wide reports.
+
+Network I/O stays in a thread pool in the main process. Each driver's
+responses are then packed into compact tuples and handed to a process
+pool, where parsing, aggregation and format_* rendering run in parallel
+without contending for the GIL.
+"""
+
+import os
+import random
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from api_f1 import F1API
+
+
+# Field order of the compact records sent to worker processes
+RACE_FIELDS = ('date', 'race', 'place', 'start', 'points')
+STATS_FIELDS = ('year', 'rank', 'starts', 'wins', 'poles', 'top5', 'top10',
+                'points')
+
+# Formatter instance owned by each worker process
+_worker_api = None
+
+
+def _init_worker():
+    """Create the per-process formatter once instead of once per task."""
+    global _worker_api
+    _worker_api = F1API()
+
+
+def pack_rows(rows, fields):
+    """
+    Convert a list of response dicts into compact tuples.
+
+    Args:
+        rows (list): Records from a race-results or stats response
+        fields (tuple): Field names to keep, in order
+
+    Returns:
+        tuple: One tuple of values per record
+    """
+    return tuple(tuple(row.get(field) for field in fields) for row in rows or ())
+
+
+def unpack_rows(rows, fields):
+    """Rebuild response dicts from pack_rows() output, dropping missing values."""
+    return [{field: value for field, value in zip(fields, row)
+             if value is not None} for row in rows]
+
+
+def build_driver_report(task, api=None):
+    """
+    Aggregate and render one driver's report. Runs in a worker process.
+
+    Args:
+        task (tuple): (driver_name, team, seasons, stats) where seasons is a
+            tuple of (year, packed race rows) and stats is packed stats rows
+        api (F1API): Formatter to render with (defaults to the worker's)
+
+    Returns:
+        tuple: (driver_name, team, summary dict, rendered report str)
+    """
+    api = api or _worker_api or F1API()
+    driver_name, team, seasons, stats = task
+
+    summary = {'points': 0, 'wins': 0, 'podiums': 0, 'races': 0,
+               'finishes': 0, 'finish_total': 0}
+    sections = []
+    for year, packed in seasons:
+        races = unpack_rows(packed, RACE_FIELDS)
+        for race in races:
+            place = race.get('place')
+            summary['points'] += race.get('points', 0) or 0
+            summary['races'] += 1
+            if str(place).isdigit():
+                place = int(place)
+                summary['finishes'] += 1
+                summary['finish_total'] += place
+                summary['wins'] += place == 1
+                summary['podiums'] += place <= 3
+        sections.append(api.format_race_results(races, driver_name, year))
+
+    if stats:
+        sections.append(api.format_career_stats(
+            unpack_rows(stats, STATS_FIELDS), driver_name))
+
+    return driver_name, team, summary, "\n\n".join(sections)
+
+
+class GridReportBuilder:
+    """
+    Builds reports for the whole grid across many seasons.
+
+    With workers=1 everything runs in the calling process; with more
+    workers the CPU-bound stage is sharded across a process pool.
+    """
+
+    def __init__(self, f1_api, workers=None, fetch_threads=8):
+        """
+        Initialize the report builder.
+
+        Args:
+            f1_api (F1API): Configured API client used for fetching
+            workers (int): Worker processes (defaults to the CPU count)
+            fetch_threads (int): Threads used for network I/O
+        """
+        self.f1_api = f1_api
+        self.workers = workers or os.cpu_count() or 1
+        self.fetch_threads = fetch_threads
+
+    def fetch_tasks(self, drivers=None, seasons=('2024',), include_stats=True):
+        """
+        Fetch race results and stats for every driver concurrently.
+
+        Args:
+            drivers (list): Driver dicts (defaults to F1API.DRIVERS_2024)
+            seasons (iterable): Season years to fetch race results for
+            include_stats (bool): Also fetch career statistics
+
+        Returns:
+            list: Compact tasks ready for build_driver_report()
+        """
+        if drivers is None:
+            drivers = self.f1_api.DRIVERS_2024.values()
+        drivers = list(drivers)
+        seasons = [str(year) for year in seasons]
+
+        def fetch(job):
+            endpoint_type, driver_id, year = job
+            if endpoint_type == 'stats':
+                return self.f1_api.fetch_data(
+                    endpoint_type='stats', driverId=driver_id)
+            return self.f1_api.fetch_data(
+                endpoint_type='race-results', driverId=driver_id, year=year)
+
+        jobs = []
+        for driver in drivers:
+            jobs.extend(('race-results', driver['id'], year)
+                        for year in seasons)
+            if include_stats:
+                jobs.append(('stats', driver['id'], None))
+
+        with ThreadPoolExecutor(self.fetch_threads) as executor:
+            responses = dict(zip(jobs, executor.map(fetch, jobs)))
+
+        tasks = []
+        for driver in drivers:
+            packed_seasons = tuple(
+                (year, pack_rows(responses[('race-results', driver['id'], year)],
+                                 RACE_FIELDS))
+                for year in seasons)
+            stats = responses.get(('stats', driver['id'], None))
+            tasks.append((driver['name'], driver['team'], packed_seasons,
+                          pack_rows(stats, STATS_FIELDS)))
+        return tasks
+
+    def render(self, tasks):
+        """
+        Run build_driver_report() over every task.
+
+        Args:
+            tasks (list): Output of fetch_tasks()
+
+        Returns:
+            list: build_driver_report() results in task order
+        """
+        if self.workers <= 1 or len(tasks) <= 1:
+            # One formatter for the whole run, as each worker process has
+            formatter = F1API()
+            return [build_driver_report(task, formatter) for task in tasks]
+
+        chunksize = max(1, len(tasks) // (self.workers * 4))
+        with ProcessPoolExecutor(self.workers,
+                                 initializer=_init_worker) as executor:
+            return list(executor.map(build_driver_report, tasks,
+                                     chunksize=chunksize))
+
+    def build_report(self, drivers=None, seasons=('2024',), include_stats=True):
+        """
+        Fetch, aggregate and render a grid-wide report.
+
+        Args:
+            drivers (list): Driver dicts (defaults to F1API.DRIVERS_2024)
+            seasons (iterable): Season years to include
+            include_stats (bool): Include career statistics sections
+
+        Returns:
+            str: Formatted grid summary followed by every driver's report
+        """
+        tasks = self.fetch_tasks(drivers, seasons, include_stats)
+        results = self.render(tasks)
+        return self.format_grid_summary(results, seasons) + "\n\n" + \
+            "\n\n".join(report for _, _, _, report in results)
+
+    def format_grid_summary(self, results, seasons):
+        """Format the aggregated per-driver summaries as a leaderboard."""
+        seasons = [str(year) for year in seasons]
+        label = seasons[0] if len(seasons) == 1 else f"{seasons[0]}-{seasons[-1]}"
+
+        output = []
+        output.append("=" * 80)
+        output.append(f"GRID SUMMARY {label}".center(80))
+        output.append("=" * 80)
+        output.append("")
+        output.append(
+            f"{'Pos':<5} {'Driver':<25} {'Team':<20} {'Pts':<8} {'Wins':<6} {'Pod':<5} {'Avg':<6}")
+        output.append("-" * 80)
+
+        ranked = sorted(results, key=lambda r: r[2]['points'], reverse=True)
+        for position, (name, team, summary, _) in enumerate(ranked, 1):
+            finishes = summary['finishes']
+            average = f"{summary['finish_total'] / finishes:.1f}" if finishes else "N/A"
+            output.append(
+                f"{position:<5} {name:<25} {team:<20} {summary['points']:<8} "
+                f"{summary['wins']:<6} {summary['podiums']:<5} {average:<6}")
+
+        output.append("=" * 80)
+        return "\n".join(output)
+
+
+def synthetic_tasks(drivers=20, seasons=20, races=24, seed=2024):
+    """
+    Generate compact tasks shaped like real responses, for benchmarking
+    without network access.
+    """
+    rng = random.Random(seed)
+    tasks = []
+    for number in range(drivers):
+        packed_seasons = []
+        stats = []
+        for offset in range(seasons):
+            year = str(2024 - offset)
+            rows = []
+            for race in range(races):
+                place = rng.randint(1, 20)
+                rows.append({'date': f"{race % 12 + 1}/{race + 1}",
+                             'race': f"Grand Prix {race + 1}",
+                             'place': place, 'start': rng.randint(1, 20),
+                             'points': max(0, 26 - place)})
+            packed_seasons.append((year, pack_rows(rows, RACE_FIELDS)))
+            stats.append({'year': int(year), 'rank': rng.randint(1, 20),
+                          'starts': races, 'wins': rng.randint(0, 5),
+                          'poles': rng.randint(0, 5), 'top5': rng.randint(0, 15),
+                          'top10': rng.randint(0, 20),
+                          'points': rng.randint(0, 400)})
+        tasks.append((f"Driver {number + 1}", "Team", tuple(packed_seasons),
+                      pack_rows(stats, STATS_FIELDS)))
+    return tasks
+
+
+def benchmark(max_workers=None, repeat=3, **task_options):
+    """
+    Time the render stage with 1..N worker processes.
+
+    Args:
+        max_workers (int): Highest worker count to try (defaults to CPU count)
+        repeat (int): Runs per worker count; the fastest is reported
+        **task_options: Passed to synthetic_tasks()
+
+    Returns:
+        list: (workers, seconds, speedup) tuples
+    """
+    tasks = synthetic_tasks(**task_options)
+    max_workers = max_workers or os.cpu_count() or 1
+    counts = sorted({1, *[n for n in (2, 4, 8, 16) if n < max_workers],
+                     max_workers})
+
+    results = []
+    baseline = None
+    for workers in counts:
+        builder = GridReportBuilder(None, workers=workers)
+        best = None
+        for _ in range(repeat):
+            started = time.perf_counter()
+            builder.render(tasks)
+            elapsed = time.perf_counter() - started
+            best = elapsed if best is None else min(best, elapsed)
+        baseline = baseline or best
+        results.append((workers, best, baseline / best))
+    return results
+
+
+if __name__ == "__main__":
+    print(f"{'Workers':<10} {'Seconds':<10} {'Speedup':<10}")
+    print("-" * 30)
+    for workers, seconds, speedup in benchmark():
+        print(f"{workers:<10} {seconds:<10.3f} {speedup:<10.2f}")
@@ -0,0 +1,223 @@
+import threading
+import time
+
+
+class APIKey:
+    """A single API credential and its observed quota."""
+
+    def __init__(self, key, label=None):
+        """
+        Initialize a key.
+
+        Args:
+            key (str): The API key
+            label (str): Name used in usage reports (defaults to a masked key)
+        """
+        self.key = key
+        self.label = label or self.mask(key)
+        self.remaining = None
+        self.limit = None
+        self.reset_at = None
+        self.disabled_until = 0.0
+        self.disabled_reason = None
+        self.requests = 0
+        self.failures = 0
+        self.current_weight = 0.0
+
+    @staticmethod
+    def mask(key):
+        """Return a key with everything but its ends hidden."""
+        if len(key) <= 8:
+            return "*" * len(key)
+        return f"{key[:4]}...{key[-4:]}"
+
+    def is_available(self, now):
+        """Return True if the key can be used at time `now`."""
+        return now >= self.disabled_until
+
+    def __repr__(self):
+        return f"APIKey({self.label})"
+
+
+class KeyPool:
+    """
+    Pool of API keys with quota tracking and weighted round-robin.
+
+    Keys are picked in proportion to their remaining quota. Keys that run
+    out of quota, or that the API rejects, are taken out of rotation until
+    their quota window resets. A key that is only being throttled (429 with
+    quota left) sits out for Retry-After seconds or the short cooldown.
+    """
+
+    # RapidAPI quota headers
+    REMAINING_HEADER = "x-ratelimit-requests-remaining"
+    LIMIT_HEADER = "x-ratelimit-requests-limit"
+    RESET_HEADER = "x-ratelimit-requests-reset"
+    RETRY_AFTER_HEADER = "retry-after"
+
+    # Status codes that take a key out of rotation
+    ROTATE_STATUSES = (401, 403, 429)
+
+    def __init__(self, keys, cooldown=60):
+        """
+        Initialize the pool.
+
+        Args:
+            keys (list): API key strings or APIKey objects
+            cooldown (float): Seconds a rejected key stays out of rotation
+                when the API doesn't say when its window resets
+        """
+        self.keys = [k if isinstance(k, APIKey) else APIKey(k)
+                     for k in keys if k]
+        if not self.keys:
+            raise ValueError("Error: At least one API key is required.")
+        self.cooldown = cooldown
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self.keys)
+
+    def available(self, now=None):
+        """Return the keys currently in rotation."""
+        now = time.time() if now is None else now
+        return [key for key in self.keys if key.is_available(now)]
+
+    def _weight(self, key, known):
+        """Remaining quota, with unknown keys treated as the best known."""
+        if key.remaining is not None:
+            return max(key.remaining, 0)
+        return max(known, default=1) or 1
+
+    def acquire(self, now=None):
+        """
+        Pick the next key using smooth weighted round-robin.
+
+        Args:
+            now (float): time.time() value to use (mainly for testing)
+
+        Returns:
+            APIKey: The key to use, or None if every key is out of rotation
+        """
+        now = time.time() if now is None else now
+        with self._lock:
+            active = []
+            for key in self.keys:
+                if key.is_available(now):
+                    if key.disabled_reason:
+                        # Window reset: forget the stale quota
+                        key.disabled_reason = None
+                        key.remaining = None
+                    active.append(key)
+            if not active:
+                return None
+
+            known = [k.remaining for k in active if k.remaining is not None]
+            weights = [self._weight(key, known) for key in active]
+            total = sum(weights)
+            for key, weight in zip(active, weights):
+                key.current_weight += weight
+            chosen = max(active, key=lambda k: k.current_weight)
+            chosen.current_weight -= total
+            chosen.requests += 1
+            if chosen.remaining:
+                chosen.remaining -= 1
+            return chosen
+
+    def record_response(self, key, status_code, headers, now=None):
+        """
+        Update a key's quota from a response.
+
+        Args:
+            key (APIKey): Key the request was sent with
+            status_code (int): HTTP status code of the response
+            headers (dict): Response headers
+            now (float): time.time() value to use (mainly for testing)
+        """
+        now = time.time() if now is None else now
+        remaining = self._header_number(headers, self.REMAINING_HEADER)
+        limit = self._header_number(headers, self.LIMIT_HEADER)
+        reset = self._header_number(headers, self.RESET_HEADER)
+        retry_after = self._header_number(headers, self.RETRY_AFTER_HEADER)
+
+        with self._lock:
+            if remaining is not None:
+                key.remaining = int(remaining)
+            if limit is not None:
+                key.limit = int(limit)
+            if reset is not None:
+                key.reset_at = now + reset
+
+            if status_code in self.ROTATE_STATUSES:
+                key.failures += 1
+                if status_code == 429 and key.remaining != 0:
+                    # Throttled, not out of quota: the reset header is the
+                    # daily/monthly window, far too long to sit out
+                    wait = self.cooldown if retry_after is None \
+                        else retry_after
+                    self._disable(key, "HTTP 429", now, until=now + wait)
+                else:
+                    self._disable(key, f"HTTP {status_code}", now)
+            elif key.remaining == 0:
+                self._disable(key, "quota exhausted", now)
+
+    def _disable(self, key, reason, now, until=None):
+        """Take a key out of rotation until `until` or its window resets."""
+        if until is not None:
+            key.disabled_until = until
+        elif key.reset_at and key.reset_at > now:
+            key.disabled_until = key.reset_at
+        else:
+            key.disabled_until = now + self.cooldown
+        key.disabled_reason = reason
+
+    @staticmethod
+    def _header_number(headers, name):
+        value = headers.get(name) if headers else None
+        try:
+            return float(value) if value is not None else None
+        except ValueError:
+            return None
+
+    def usage(self, now=None):
+        """
+        Report usage for every key.
+
+        Returns:
+            list: One dict per key with label, requests, failures,
+                remaining, limit and status
+        """
+        now = time.time() if now is None else now
+        report = []
+        for key in self.keys:
+            if key.is_available(now):
+                status = "active"
+            else:
+                wait = int(key.disabled_until - now)
+                status = f"{key.disabled_reason} ({wait}s)"
+            report.append({
+                'label': key.label,
+                'requests': key.requests,
+                'failures': key.failures,
+                'remaining': key.remaining,
+                'limit': key.limit,
+                'status': status,
+            })
+        return report
+
+    def format_usage(self):
+        """Format per-key usage for console display."""
+        output = []
+        output.append("=" * 70)
+        output.append("API KEY USAGE".center(70))
+        output.append("=" * 70)
+        output.append(
+            f"{'Key':<14} {'Requests':<10} {'Failures':<10} {'Remaining':<11} {'Status':<20}")
+        output.append("-" * 70)
+        for row in self.usage():
+            remaining = "?" if row['remaining'] is None else row['remaining']
+            if row['limit'] is not None:
+                remaining = f"{remaining}/{row['limit']}"
+            output.append(
+                f"{row['label']:<14} {row['requests']:<10} {row['failures']:<10} {remaining:<11} {row['status']:<20}")
+        output.append("=" * 70)
+        return "\n".join(output)
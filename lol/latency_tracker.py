@@ -0,0 +1,94 @@
+import threading
+from collections import deque
+
+
+class LatencyTracker:
+    """
+    Rolling per-endpoint latency samples.
+
+    Used to derive adaptive request timeouts from observed percentiles
+    and to decide when a hedged request should be sent.
+    """
+
+    def __init__(self, window=200, min_samples=20, multiplier=3.0,
+                 min_timeout=1.0):
+        """
+        Initialize the tracker.
+
+        Args:
+            window (int): Samples kept per endpoint
+            min_samples (int): Samples needed before adapting timeouts
+            multiplier (float): Timeout = p99 latency * multiplier
+            min_timeout (float): Lower bound for adaptive timeouts
+        """
+        self.window = window
+        self.min_samples = min_samples
+        self.multiplier = multiplier
+        self.min_timeout = min_timeout
+        self._samples = {}
+        self._sorted = {}
+        self._lock = threading.Lock()
+
+    def record(self, endpoint, seconds):
+        """
+        Record how long a request took.
+
+        Args:
+            endpoint (str): Endpoint path the request was sent to
+            seconds (float): Observed latency
+        """
+        with self._lock:
+            samples = self._samples.get(endpoint)
+            if samples is None:
+                samples = self._samples[endpoint] = deque(maxlen=self.window)
+            samples.append(seconds)
+            self._sorted.pop(endpoint, None)
+
+    def count(self, endpoint):
+        """Return the number of samples held for an endpoint."""
+        return len(self._samples.get(endpoint, ()))
+
+    def percentile(self, endpoint, percent):
+        """
+        Return a latency percentile for an endpoint.
+
+        Args:
+            endpoint (str): Endpoint path
+            percent (float): Percentile between 0 and 100
+
+        Returns:
+            float: Latency in seconds, or None without enough samples
+        """
+        with self._lock:
+            if len(self._samples.get(endpoint, ())) < self.min_samples:
+                return None
+            ordered = self._sorted.get(endpoint)
+            if ordered is None:
+                ordered = self._sorted[endpoint] = sorted(
+                    self._samples[endpoint])
+        index = min(len(ordered) - 1, int(len(ordered) * percent / 100))
+        return ordered[index]
+
+    def timeout_for(self, endpoint, default):
+        """
+        Return the timeout to use for the next request to an endpoint.
+
+        Args:
+            endpoint (str): Endpoint path
+            default (float): Fixed timeout, also used as the upper bound
+
+        Returns:
+            float: p99 latency * multiplier, clamped to [min_timeout, default]
+        """
+        p99 = self.percentile(endpoint, 99)
+        if p99 is None:
+            return default
+        return min(default, max(self.min_timeout, p99 * self.multiplier))
+
+    def hedge_delay(self, endpoint):
+        """
+        Return how long to wait before hedging a request (the p95
+        latency), or None until enough samples have been seen.
+        """
+        return self.percentile(endpoint, 95)
+
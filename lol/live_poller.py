@@ -0,0 +1,384 @@
+import queue
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
+from diff_engine import DiffEngine
+
+
+class RateBudget:
+    """
+    Token bucket shared by every subscription of a poller.
+    Keeps the combined request rate under the API plan's limit.
+    """
+
+    def __init__(self, requests_per_minute=30, burst=None):
+        """
+        Initialize the rate budget.
+
+        Args:
+            requests_per_minute (float): Sustained request rate allowed
+            burst (int): Maximum tokens that can accumulate (defaults to rate)
+        """
+        self.rate = requests_per_minute / 60.0
+        self.capacity = burst if burst is not None else max(
+            1, int(requests_per_minute))
+        self.tokens = float(self.capacity)
+        self.updated_at = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self):
+        now = time.monotonic()
+        self.tokens = min(self.capacity,
+                          self.tokens + (now - self.updated_at) * self.rate)
+        self.updated_at = now
+
+    def try_acquire(self, cost=1):
+        """
+        Take tokens from the budget without waiting.
+
+        Args:
+            cost (int): Number of tokens the request costs
+
+        Returns:
+            bool: True if the tokens were taken, False if the budget is empty
+        """
+        with self._lock:
+            self._refill()
+            if self.tokens >= cost:
+                self.tokens -= cost
+                return True
+            return False
+
+    def acquire(self, cost=1, timeout=None):
+        """
+        Take tokens from the budget, waiting for a refill if needed.
+
+        Args:
+            cost (int): Number of tokens the request costs
+            timeout (float): Maximum seconds to wait, or None to wait forever
+
+        Returns:
+            bool: True if the tokens were taken, False on timeout
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            with self._lock:
+                self._refill()
+                if self.tokens >= cost:
+                    self.tokens -= cost
+                    return True
+                wait = (cost - self.tokens) / self.rate
+            if deadline is not None:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return False
+                wait = min(wait, remaining)
+            time.sleep(wait)
+
+
+class Subscription:
+    """A single tracked endpoint/parameter combination."""
+
+    def __init__(self, endpoint_type, params, callback=None):
+        """
+        Initialize a subscription.
+
+        Args:
+            endpoint_type (str): F1API endpoint type (e.g. 'race-report')
+            params (dict): Parameters passed to F1API.fetch_data()
+            callback (callable): Called as callback(subscription, changes)
+        """
+        self.endpoint_type = endpoint_type
+        self.params = dict(params)
+        self.callback = callback
+        self.key = (endpoint_type, tuple(sorted(self.params.items())))
+        self.session_state = 'unknown'
+        self.interval = LivePoller.STATE_INTERVALS['unknown'][0]
+        self.next_poll = 0.0
+        self.last_data = None
+        self.polls = 0
+        self.changes = 0
+        self.in_flight = False
+
+    def __repr__(self):
+        params = ", ".join(f"{k}={v}" for k, v in sorted(self.params.items()))
+        return f"Subscription({self.endpoint_type}: {params})"
+
+
+class LivePoller:
+    """
+    Race-weekend polling engine built on top of F1API.
+
+    Tracks many events and drivers at once, adapts each poll interval
+    to the session state and to how often the data changed, and pushes
+    only the differences to subscribers.
+    """
+
+    # (min, max) poll interval in seconds for each session state
+    STATE_INTERVALS = {
+        'live': (5, 60),
+        'upcoming': (60, 600),
+        'unknown': (30, 900),
+        'scheduled': (900, 3600),
+        'finished': (900, 3600),
+    }
+
+    # How far ahead of the session start an event counts as upcoming
+    UPCOMING_WINDOW = timedelta(hours=24)
+
+    def __init__(self, f1_api, rate_budget=None, max_workers=4,
+                 diff_engine=None):
+        """
+        Initialize the poller.
+
+        Args:
+            f1_api (F1API): Configured API client used for every fetch
+            rate_budget (RateBudget): Budget shared by all subscriptions
+            max_workers (int): Number of polls allowed in flight at once
+            diff_engine (DiffEngine): Engine used to detect changes; share
+                one with other consumers to reuse its cached responses
+        """
+        self.f1_api = f1_api
+        self.rate_budget = rate_budget or RateBudget()
+        self.diff_engine = diff_engine or DiffEngine()
+        self.max_workers = max_workers
+        self.subscriptions = {}
+        self._updates = queue.Queue()
+        self._lock = threading.Lock()
+        self._executor = None
+        self._thread = None
+        self._stop = threading.Event()
+
+    def subscribe(self, endpoint_type, callback=None, **params):
+        """
+        Track an endpoint. Re-subscribing to the same endpoint and
+        parameters returns the existing subscription.
+
+        Args:
+            endpoint_type (str): F1API endpoint type
+            callback (callable): Called as callback(subscription, changes)
+            **params: Parameters passed to F1API.fetch_data()
+
+        Returns:
+            Subscription: The tracked subscription
+        """
+        subscription = Subscription(endpoint_type, params, callback)
+        with self._lock:
+            existing = self.subscriptions.get(subscription.key)
+            if existing:
+                if callback is not None:
+                    existing.callback = callback
+                return existing
+            self.subscriptions[subscription.key] = subscription
+        return subscription
+
+    def subscribe_event(self, event_id, callback=None):
+        """Track the race report for an event."""
+        return self.subscribe('race-report', callback, eventId=str(event_id))
+
+    def subscribe_driver(self, driver_id, year='2024', callback=None):
+        """Track a driver's race results for a season."""
+        return self.subscribe('race-results', callback,
+                              driverId=str(driver_id), year=str(year))
+
+    def unsubscribe(self, subscription):
+        """Stop tracking a subscription."""
+        with self._lock:
+            self.subscriptions.pop(subscription.key, None)
+
+    def poll_once(self, now=None):
+        """
+        Poll every subscription that is due, concurrently.
+
+        Args:
+            now (float): time.monotonic() value to use (mainly for testing)
+
+        Returns:
+            list: (subscription, ChangeSet) tuples for subscriptions that changed
+        """
+        now = time.monotonic() if now is None else now
+        with self._lock:
+            due = [s for s in self.subscriptions.values()
+                   if s.next_poll <= now and not s.in_flight]
+            for subscription in due:
+                subscription.in_flight = True
+
+        if not due:
+            return []
+
+        executor = self._executor or ThreadPoolExecutor(self.max_workers)
+        try:
+            results = list(executor.map(self._poll, due))
+        finally:
+            if executor is not self._executor:
+                executor.shutdown()
+        return [result for result in results if result is not None]
+
+    def _poll(self, subscription):
+        """Fetch one subscription and publish its changes, if any."""
+        try:
+            endpoint = self.f1_api.ENDPOINTS.get(subscription.endpoint_type)
+            self.rate_budget.acquire(endpoint.rate_cost if endpoint else 1)
+            data = self.f1_api.fetch_data(
+                endpoint_type=subscription.endpoint_type, cache_ttl=0,
+                **subscription.params)
+            subscription.polls += 1
+
+            if data is None:
+                # Failed fetch: back off without touching the last good copy
+                self._schedule(subscription, changed=False)
+                return None
+
+            if subscription.endpoint_type == 'race-report':
+                subscription.session_state = self.detect_session_state(data)
+
+            changes = self.diff_engine.update(
+                subscription.endpoint_type, subscription.params, data)
+            subscription.last_data = data
+            self._schedule(subscription, bool(changes))
+
+            if not changes:
+                return None
+
+            subscription.changes += 1
+            self._publish(subscription, changes)
+            return subscription, changes
+        except Exception as e:
+            # Back off as for a failed fetch, so a raising poll can't spin
+            print(f"Error: Polling {subscription!r} failed: {e}")
+            self._schedule(subscription, changed=False)
+            return None
+        finally:
+            subscription.in_flight = False
+
+    def _schedule(self, subscription, changed):
+        """Adapt the poll interval and set the next poll time."""
+        state = subscription.session_state
+        if subscription.endpoint_type != 'race-report':
+            state = self.weekend_state()
+        low, high = self.STATE_INTERVALS[state]
+
+        if changed:
+            interval = subscription.interval / 2
+        else:
+            interval = subscription.interval * 1.5
+        subscription.interval = min(high, max(low, interval))
+        subscription.next_poll = time.monotonic() + subscription.interval
+
+    def _publish(self, subscription, changes):
+        """Deliver changes to the subscription callback and the update queue."""
+        self._updates.put((subscription, changes))
+        if subscription.callback is not None:
+            try:
+                subscription.callback(subscription, changes)
+            except Exception as e:
+                print(f"Error: Subscriber callback failed: {e}")
+
+    def weekend_state(self):
+        """
+        Return the most active session state across tracked events.
+        Driver subscriptions follow this so results are polled quickly
+        while a race is running.
+        """
+        order = ['live', 'upcoming', 'unknown', 'scheduled', 'finished']
+        # Snapshot under the lock; workers call this while others subscribe
+        with self._lock:
+            states = [s.session_state for s in self.subscriptions.values()
+                      if s.endpoint_type == 'race-report']
+        for state in order:
+            if state in states:
+                return state
+        return 'unknown'
+
+    def detect_session_state(self, data, now=None):
+        """
+        Work out whether an event is upcoming, live or finished.
+
+        Args:
+            data (dict): race-report response
+            now (datetime): Current UTC time (mainly for testing)
+
+        Returns:
+            str: 'live', 'upcoming', 'scheduled', 'finished' or 'unknown'
+        """
+        racestrip = (data.get('report') or {}).get('racestrip') or {}
+        start = self._parse_date(racestrip.get('date'))
+        end = self._parse_date(racestrip.get('endDate'))
+        if start is None:
+            return 'unknown'
+
+        now = now or datetime.now(timezone.utc)
+        end = end or start + timedelta(hours=3)
+        if now > end:
+            return 'finished'
+        if now >= start:
+            return 'live'
+        if start - now <= self.UPCOMING_WINDOW:
+            return 'upcoming'
+        return 'scheduled'
+
+    @staticmethod
+    def _parse_date(value):
+        """Parse the API's ISO dates (e.g. '2024-03-07T13:30Z')."""
+        if not value:
+            return None
+        try:
+            return datetime.fromisoformat(value.replace('Z', '+00:00'))
+        except ValueError:
+            return None
+
+    def start(self, tick=1.0):
+        """
+        Start polling in a background thread.
+
+        Args:
+            tick (float): Seconds between checks for due subscriptions
+        """
+        if self._thread and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._executor = ThreadPoolExecutor(self.max_workers)
+        self._thread = threading.Thread(
+            target=self._run, args=(tick,), daemon=True)
+        self._thread.start()
+
+    def _run(self, tick):
+        while not self._stop.is_set():
+            with self._lock:
+                due = [s for s in self.subscriptions.values()
+                       if not s.in_flight and s.next_poll <= time.monotonic()]
+                for subscription in due:
+                    subscription.in_flight = True
+            # Submit without waiting so a slow poll never delays the others
+            for subscription in due:
+                self._executor.submit(self._poll, subscription)
+            self._stop.wait(tick)
+
+    def stop(self):
+        """Stop the background thread and wait for in-flight polls."""
+        self._stop.set()
+        if self._thread:
+            self._thread.join()
+            self._thread = None
+        if self._executor:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+
+    def updates(self, timeout=None):
+        """
+        Generator yielding (subscription, ChangeSet) tuples as changes arrive.
+
+        Args:
+            timeout (float): Stop after this many seconds without an update,
+                or None to keep waiting while the poller is running
+
+        Yields:
+            tuple: (subscription, ChangeSet)
+        """
+        while True:
+            try:
+                yield self._updates.get(timeout=timeout if timeout else 1.0)
+            except queue.Empty:
+                if timeout or self._stop.is_set() or self._thread is None:
+                    return
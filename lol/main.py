@@ -1,4 +1,18 @@
+import os
 from api_f1 import F1API
+from driver_views import DriverViews
+from response_cache import ResponseCache
+
+# Responses are kept on disk so the viewer keeps working offline
+CACHE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), ".f1_cache")
+
+
+def print_with_note(f1_api, text, note=None):
+    """Print formatted output followed by its offline staleness note."""
+    print("\n" + text)
+    note = f1_api.staleness_note() if note is None else note
+    if note:
+        print(note)
 
 
 def handle_race_report(f1_api):
@@ -18,8 +32,8 @@ def handle_race_report(f1_api):
         data = f1_api.fetch_data(endpoint_type='race-report', eventId=event_id)
 
         if data:
-            formatted_output = f1_api.format_output(data)
-            print("\n" + formatted_output)
+            formatted_output = f1_api.format_response('race-report', data)
+            print_with_note(f1_api, formatted_output)
         else:
             print("\n Failed to fetch data. Please check the Event ID and try again.")
 
@@ -56,7 +70,8 @@ def handle_driver_stats(f1_api):
                     data = f1_api.fetch_data(
                         endpoint_type='athlete-info', athleteId=driver_id)
                     if data:
-                        print("\n" + f1_api.format_athlete_info(data))
+                        print_with_note(f1_api, f1_api.format_response(
+                            'athlete-info', data))
                     else:
                         print("\n Failed to fetch driver information.")
 
@@ -67,7 +82,9 @@ def handle_driver_stats(f1_api):
                     data = f1_api.fetch_data(
                         endpoint_type='race-results', driverId=driver_id, year='2024')
                     if data:
-                        print("\n" + f1_api.format_race_results(data, driver_name))
+                        print_with_note(
+                            f1_api, f1_api.format_response(
+                                'race-results', data, driver_name))
                     else:
                         print("\n Failed to fetch race results.")
 
@@ -78,7 +95,9 @@ def handle_driver_stats(f1_api):
                     data = f1_api.fetch_data(
                         endpoint_type='stats', driverId=driver_id)
                     if data:
-                        print("\n" + f1_api.format_career_stats(data, driver_name))
+                        print_with_note(
+                            f1_api, f1_api.format_response(
+                                'stats', data, driver_name))
                     else:
                         print("\n Failed to fetch career statistics.")
 
@@ -90,24 +109,32 @@ def handle_driver_stats(f1_api):
                     print("\n Loading driver information...")
                     info_data = f1_api.fetch_data(
                         endpoint_type='athlete-info', athleteId=driver_id)
+                    info_note = f1_api.staleness_note()
 
                     print(" Loading 2024 race results...")
                     results_data = f1_api.fetch_data(
                         endpoint_type='race-results', driverId=driver_id, year='2024')
+                    results_note = f1_api.staleness_note()
 
                     print(" Loading career statistics...")
                     stats_data = f1_api.fetch_data(
                         endpoint_type='stats', driverId=driver_id)
+                    stats_note = f1_api.staleness_note()
 
                     # Display all data
                     if info_data:
-                        print("\n" + f1_api.format_athlete_info(info_data))
+                        print_with_note(
+                            f1_api, f1_api.format_response(
+                                'athlete-info', info_data), info_note)
                     if results_data:
-                        print(
-                            "\n" + f1_api.format_race_results(results_data, driver_name))
+                        print_with_note(
+                            f1_api, f1_api.format_response(
+                                'race-results', results_data, driver_name),
+                            results_note)
                     if stats_data:
-                        print(
-                            "\n" + f1_api.format_career_stats(stats_data, driver_name))
+                        print_with_note(
+                            f1_api, f1_api.format_response(
+                                'stats', stats_data, driver_name), stats_note)
 
                     if not (info_data or results_data or stats_data):
                         print("\n Failed to fetch driver statistics.")
@@ -123,6 +150,67 @@ def handle_driver_stats(f1_api):
                 print("Please try again.")
 
 
+def load_driver_views(f1_api, views, driver):
+    """
+    Fetch a driver's 2024 results and career stats into the views.
+
+    Returns:
+        tuple: (True if anything was loaded, list of offline staleness notes)
+    """
+    driver_id = driver['id']
+    print(f" Loading data for {driver['name']}...")
+    results = f1_api.fetch_data(
+        endpoint_type='race-results', driverId=driver_id, year='2024')
+    results_note = f1_api.staleness_note()
+    if results:
+        views.update('race-results', {'driverId': driver_id, 'year': '2024'},
+                     results)
+    stats = f1_api.fetch_data(endpoint_type='stats', driverId=driver_id)
+    stats_note = f1_api.staleness_note()
+    if stats:
+        views.update('stats', {'driverId': driver_id}, stats)
+    notes = [note for note in (results_note, stats_note) if note]
+    return bool(results or stats), notes
+
+
+def handle_compare_drivers(f1_api, views):
+    """Handle side-by-side driver comparison."""
+    f1_api.display_driver_menu()
+
+    print("\nSelect the first driver.")
+    driver_a = f1_api.get_driver_choice()
+    if driver_a is None:
+        return
+    print("\nSelect the second driver.")
+    driver_b = f1_api.get_driver_choice()
+    if driver_b is None:
+        return
+
+    try:
+        print()
+        loaded = False
+        notes = []
+        for driver in (driver_a, driver_b):
+            driver_loaded, driver_notes = load_driver_views(
+                f1_api, views, driver)
+            loaded = loaded or driver_loaded
+            notes.extend(driver_notes)
+        if not loaded:
+            print("\n Failed to fetch driver statistics.")
+            return
+
+        # One line per distinct note, as each stale response has its own age
+        print_with_note(f1_api, views.format_comparison(
+            driver_a['id'], driver_b['id']), "\n".join(dict.fromkeys(notes)))
+        if views.leaderboard('2024'):
+            # Ranks only the drivers loaded so far; the title says how many
+            print("\n" + views.format_leaderboard('2024'))
+
+    except Exception as e:
+        print(f"\n Error: {e}")
+        print("Please try again.")
+
+
 def main():
     """
     Main application entry point.
@@ -134,9 +222,20 @@ def main():
         print(f"\n{e}")
         return
 
+    # Reuse responses fetched earlier, and serve them while offline
+    f1_api.cache = ResponseCache(directory=CACHE_DIR)
+    # Comparison views are kept for the whole session
+    views = DriverViews(f1_api.DRIVERS_2024)
+
     print("\n  Welcome to the F1 Race Report & Driver Stats Viewer! 🏁")
 
     while True:
+        refreshed = f1_api.process_refresh_queue()
+        if refreshed:
+            print(f"\n Connection restored - refreshed {refreshed} cached item(s).")
+        if f1_api.is_offline():
+            print("\n [Offline] Showing cached data until the connection returns.")
+
         f1_api.display_menu()
         choice = f1_api.get_user_choice()
 
@@ -159,6 +258,15 @@ def main():
                 break
 
         elif choice == '3':
+            # Driver Comparison
+            handle_compare_drivers(f1_api, views)
+
+            continue_choice = input(
+                "\nPress Enter to return to main menu or 'q' to quit: ").strip().lower()
+            if continue_choice == 'q':
+                break
+
+        elif choice == '4':
             print("\n Thank you for using F1 Race Report & Driver Stats Viewer!")
             print("See you at the next race! 🏎️💨\n")
             break
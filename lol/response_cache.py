@@ -0,0 +1,413 @@
+"""
+Compact response cache for F1 API payloads.
+
+Entries are stored as encoded bytes, both in memory and (optionally) on
+disk. The default codec is zlib-compressed JSON primed with a shared
+dictionary of F1 payload fragments; msgpack and zstd codecs are also
+available when their packages are installed. Run this module to compare
+their size and decode speed.
+"""
+
+import hashlib
+import json
+import os
+import random
+import struct
+import threading
+import time
+import zlib
+from collections import OrderedDict
+
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+
+def sample_payloads():
+    """
+    Return representative F1 API payloads, used to build shared
+    compression dictionaries and to benchmark codecs.
+    """
+    race_results = [
+        {"date": f"{month}/{day}", "race": name, "place": place,
+         "start": start, "points": points}
+        for month, day, name, place, start, points in [
+            (3, 2, "Gulf Air Bahrain Grand Prix", 1, 1, 26),
+            (3, 9, "STC Saudi Arabian Grand Prix", 1, 1, 25),
+            (3, 24, "Rolex Australian Grand Prix", "DNF", 1, 0),
+            (4, 7, "MSC Cruises Japanese Grand Prix", 1, 1, 25),
+            (5, 26, "Grand Prix de Monaco", 6, 6, 8),
+            (10, 20, "Pirelli United States Grand Prix", 3, 2, 23),
+        ]
+    ]
+    stats = [
+        {"year": year, "rank": rank, "starts": starts, "wins": wins,
+         "poles": poles, "top5": top5, "top10": top10, "points": points}
+        for year, rank, starts, wins, poles, top5, top10, points in [
+            (2021, 1, 22, 10, 10, 18, 21, 395.5),
+            (2022, 1, 22, 15, 7, 21, 22, 454),
+            (2023, 1, 22, 19, 12, 22, 22, 575),
+            (2024, 1, 18, 8, 7, 15, 17, 395),
+        ]
+    ]
+    athlete_info = {
+        "fullName": "Max Verstappen", "dateOfBirth": "1997-09-30T07:00Z",
+        "birthPlace": {"city": "Hasselt", "country": "Belgium"},
+        "vehicles": [{"team": "Red Bull", "number": "1",
+                      "manufacturer": "Red Bull", "chassis": "RB20",
+                      "engine": "Honda RBPTH002", "tire": "Pirelli"}],
+        "link": "https://www.espn.com/racing/driver/_/id/4665/max-verstappen",
+    }
+    race_report = {
+        "report": {"racestrip": {
+            "name": "STC Saudi Arabian Grand Prix",
+            "shortName": "STC Saudi Arabian GP", "season": 2024,
+            "date": "2024-03-07T13:30Z", "endDate": "2024-03-09T17:00Z",
+            "circuit": {"name": "Jeddah Street Circuit",
+                        "countryFlag": {"alt": "Saudi Arabia"}},
+            "broadcasts": [{"network": "ESPN"}, {"network": "Sky Sports"},
+                           {"network": "F1 TV"}],
+        }}
+    }
+    return [race_results, stats, athlete_info, race_report]
+
+
+def _dump_json(data):
+    return json.dumps(data, separators=(",", ":")).encode("utf-8")
+
+
+class JsonCodec:
+    """Plain JSON text, as the API returns it."""
+
+    name = "json"
+
+    def encode(self, data):
+        return _dump_json(data)
+
+    def decode(self, blob):
+        return json.loads(blob)
+
+
+class ZlibJsonCodec:
+    """
+    Compact JSON compressed with zlib and a preset dictionary of F1
+    payload fragments, so even small responses compress well.
+    """
+
+    name = "zlib"
+
+    def __init__(self, level=6, dictionary=None):
+        self.level = level
+        if dictionary is None:
+            dictionary = b"".join(_dump_json(p) for p in sample_payloads())
+        self.dictionary = dictionary
+
+    def encode(self, data):
+        compressor = zlib.compressobj(self.level, zdict=self.dictionary)
+        return compressor.compress(_dump_json(data)) + compressor.flush()
+
+    def decode(self, blob):
+        decompressor = zlib.decompressobj(zdict=self.dictionary)
+        text = decompressor.decompress(blob) + decompressor.flush()
+        if not decompressor.eof:
+            raise zlib.error("Truncated zlib stream.")
+        return json.loads(text)
+
+
+class MsgpackCodec:
+    """Binary msgpack encoding (requires the msgpack package)."""
+
+    name = "msgpack"
+
+    def __init__(self):
+        if msgpack is None:
+            raise ImportError("msgpack is not installed.")
+
+    def encode(self, data):
+        return msgpack.packb(data, use_bin_type=True)
+
+    def decode(self, blob):
+        return msgpack.unpackb(blob, raw=False)
+
+
+class ZstdJsonCodec:
+    """
+    JSON compressed with zstd and a dictionary trained on F1 payloads
+    (requires the zstandard package).
+    """
+
+    name = "zstd"
+
+    def __init__(self, level=3, samples=None, dict_size=4096):
+        if zstandard is None:
+            raise ImportError("zstandard is not installed.")
+        samples = samples or self._training_samples()
+        try:
+            dictionary = zstandard.train_dictionary(dict_size, samples)
+        except zstandard.ZstdError:
+            # Too few samples to train on: use them as a raw dictionary
+            dictionary = zstandard.ZstdCompressionDict(b"".join(samples))
+        self._compressor = zstandard.ZstdCompressor(
+            level=level, dict_data=dictionary)
+        self._decompressor = zstandard.ZstdDecompressor(dict_data=dictionary)
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _training_samples():
+        """Split the sample payloads into record-sized training samples."""
+        samples = []
+        for payload in sample_payloads():
+            records = payload if isinstance(payload, list) else [payload]
+            samples.extend(_dump_json(record) for record in records)
+            samples.append(_dump_json(payload))
+        # zstd needs a reasonable number of samples to train
+        return samples * 8
+
+    def encode(self, data):
+        with self._lock:
+            return self._compressor.compress(_dump_json(data))
+
+    def decode(self, blob):
+        with self._lock:
+            return json.loads(self._decompressor.decompress(blob))
+
+
+# Errors a codec may raise when decoding a truncated or corrupt entry
+# (JSON and msgpack decode errors are ValueError subclasses)
+DECODE_ERRORS = (zlib.error, ValueError, EOFError)
+if zstandard is not None:
+    DECODE_ERRORS += (zstandard.ZstdError,)
+
+
+def available_codecs():
+    """Return an instance of every codec whose dependencies are installed."""
+    codecs = [JsonCodec(), ZlibJsonCodec()]
+    for codec_class in (MsgpackCodec, ZstdJsonCodec):
+        try:
+            codecs.append(codec_class())
+        except ImportError:
+            pass
+    return codecs
+
+
+def default_codec():
+    """
+    Return the default codec. zlib with the shared dictionary is the most
+    compact on F1 payloads and needs nothing outside the standard library.
+    """
+    return ZlibJsonCodec()
+
+
+class ResponseCache:
+    """
+    LRU cache of encoded API responses with optional on-disk persistence.
+    """
+
+    # On-disk header: stored-at timestamp (double)
+    HEADER = struct.Struct("<d")
+
+    def __init__(self, codec=None, directory=None, max_entries=512):
+        """
+        Initialize the cache.
+
+        Args:
+            codec: Object with encode()/decode() (defaults to default_codec())
+            directory (str): Folder for persistent entries, or None for
+                memory only
+            max_entries (int): Entries kept in memory before evicting
+        """
+        self.codec = codec or default_codec()
+        self.directory = directory
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+        if self.directory:
+            os.makedirs(self.directory, exist_ok=True)
+
+    @staticmethod
+    def make_key(endpoint, params=None):
+        """Build a cache key from an endpoint path and query parameters."""
+        query = "&".join(f"{k}={v}" for k, v in sorted((params or {}).items()))
+        return f"{endpoint}?{query}"
+
+    def _path(self, key):
+        digest = hashlib.sha1(key.encode("utf-8")).hexdigest()
+        return os.path.join(self.directory, f"{digest}.{self.codec.name}")
+
+    def _load_from_disk(self, key):
+        """Read an entry from disk into memory, if present."""
+        if not self.directory:
+            return None
+        try:
+            with open(self._path(key), "rb") as f:
+                raw = f.read()
+        except OSError:
+            return None
+        if len(raw) < self.HEADER.size:
+            return None
+        stored_at, = self.HEADER.unpack_from(raw)
+        return stored_at, raw[self.HEADER.size:]
+
+    def get_entry(self, key, max_age=None):
+        """
+        Look up a cached response.
+
+        Args:
+            key (str): Cache key from make_key()
+            max_age (float): Ignore entries older than this many seconds
+
+        Returns:
+            tuple: (data, stored_at) or None if missing, too old or corrupt
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+        if entry is None:
+            entry = self._load_from_disk(key)
+            if entry is not None:
+                self._remember(key, entry)
+
+        if entry is None or (max_age is not None
+                             and time.time() - entry[0] > max_age):
+            self.misses += 1
+            return None
+
+        stored_at, blob = entry
+        try:
+            data = self.codec.decode(blob)
+        except DECODE_ERRORS:
+            # A corrupt entry (e.g. left by a crash) is dropped, not fatal
+            self.discard(key)
+            self.misses += 1
+            return None
+
+        self.hits += 1
+        return data, stored_at
+
+    def get(self, key, max_age=None):
+        """Return cached data for a key, or None (see get_entry())."""
+        entry = self.get_entry(key, max_age)
+        return entry[0] if entry else None
+
+    def set(self, key, data):
+        """
+        Store a response.
+
+        Args:
+            key (str): Cache key from make_key()
+            data: JSON-compatible response data
+        """
+        entry = (time.time(), self.codec.encode(data))
+        self._remember(key, entry)
+        if self.directory:
+            path = self._path(key)
+            # Write a private temp file and rename it into place, so readers
+            # never see a half-written entry
+            temp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+            try:
+                with open(temp_path, "wb") as f:
+                    f.write(self.HEADER.pack(entry[0]) + entry[1])
+                os.replace(temp_path, path)
+            except OSError as e:
+                print(f"Warning: Could not write cache entry: {e}")
+                try:
+                    os.remove(temp_path)
+                except OSError:
+                    pass
+
+    def discard(self, key):
+        """Remove an entry from memory and disk."""
+        with self._lock:
+            self._entries.pop(key, None)
+        if self.directory:
+            try:
+                os.remove(self._path(key))
+            except OSError:
+                pass
+
+    def _remember(self, key, entry):
+        with self._lock:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        """Drop every in-memory entry (on-disk entries are kept)."""
+        with self._lock:
+            self._entries.clear()
+
+    def size_bytes(self):
+        """Return the in-memory size of all encoded entries."""
+        with self._lock:
+            return sum(len(blob) for _, blob in self._entries.values())
+
+
+def varied_payloads(count=40, seed=2024):
+    """
+    Return payloads shaped like sample_payloads() but with different
+    values, so benchmarks don't just measure the shared dictionary.
+    """
+    rng = random.Random(seed)
+    payloads = []
+    for _ in range(count):
+        for payload in sample_payloads():
+            records = payload if isinstance(payload, list) else None
+            if records is None:
+                payloads.append(payload)
+                continue
+            varied = []
+            for record in records * rng.randint(2, 4):
+                record = dict(record)
+                for field, value in record.items():
+                    if isinstance(value, (int, float)) and field != "year":
+                        record[field] = rng.randint(0, 400)
+                varied.append(record)
+            payloads.append(varied)
+    return payloads
+
+
+def benchmark_codecs(payloads=None, repeat=20):
+    """
+    Compare cache-resident size and decode speed of each available codec.
+
+    Args:
+        payloads (list): Responses to encode (defaults to varied_payloads())
+        repeat (int): Decode passes used for timing
+
+    Returns:
+        list: (codec name, total bytes, ratio vs JSON, decode µs per payload)
+    """
+    payloads = payloads or varied_payloads()
+    results = []
+    json_size = None
+    for codec in available_codecs():
+        blobs = [codec.encode(payload) for payload in payloads]
+        size = sum(len(blob) for blob in blobs)
+        json_size = json_size or size
+
+        started = time.perf_counter()
+        for _ in range(repeat):
+            for blob in blobs:
+                codec.decode(blob)
+        elapsed = time.perf_counter() - started
+        per_payload = elapsed / (repeat * len(blobs)) * 1e6
+        results.append((codec.name, size, json_size / size, per_payload))
+    return results
+
+
+if __name__ == "__main__":
+    print(f"{'Codec':<10} {'Bytes':<8} {'Ratio':<8} {'Decode (µs)':<12}")
+    print("-" * 40)
+    for name, size, ratio, decode_us in benchmark_codecs():
+        print(f"{name:<10} {size:<8} {ratio:<8.2f} {decode_us:<12.1f}")
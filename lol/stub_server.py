@@ -0,0 +1,119 @@
+"""
+Local stub of the F1 Motorsport Data API for offline benchmarks.
+
+Serves canned JSON payloads per endpoint path with configurable latency
+jitter, so timeouts, hedging and caching can be measured reproducibly.
+"""
+
+import json
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse
+from response_cache import sample_payloads
+
+
+def default_payloads():
+    """Return sample payloads keyed by endpoint path."""
+    race_results, stats, athlete_info, race_report = sample_payloads()
+    return {
+        "/race-report": race_report,
+        "/athlete-info": athlete_info,
+        "/race-results": race_results,
+        "/stats": stats,
+    }
+
+
+class _StubHTTPServer(ThreadingHTTPServer):
+    # A deep backlog so bursts of concurrent requests aren't dropped
+    request_queue_size = 128
+    daemon_threads = True
+
+
+class StubServer:
+    """
+    Threaded HTTP server answering API paths with canned payloads.
+
+    Use as a context manager; base_url points at the running server.
+    """
+
+    def __init__(self, payloads=None, latency=(0.0, 0.0), slow_probability=0.0,
+                 slow_latency=0.0, seed=None):
+        """
+        Initialize the stub server.
+
+        Args:
+            payloads (dict): Response data keyed by path (defaults to samples)
+            latency (tuple): (min, max) seconds of uniform jitter per request
+            slow_probability (float): Chance a request is a slow outlier
+            slow_latency (float): Extra seconds added to slow outliers
+            seed (int): Random seed for reproducible jitter
+        """
+        self.payloads = payloads or default_payloads()
+        self.latency = latency
+        self.slow_probability = slow_probability
+        self.slow_latency = slow_latency
+        self.requests = 0
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self._encoded = {path: json.dumps(data).encode("utf-8")
+                         for path, data in self.payloads.items()}
+        self._server = None
+        self._thread = None
+
+    @property
+    def base_url(self):
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def _delay(self):
+        """Pick the latency for the next request."""
+        with self._lock:
+            self.requests += 1
+            delay = self._random.uniform(*self.latency)
+            if self._random.random() < self.slow_probability:
+                delay += self.slow_latency
+        return delay
+
+    def start(self):
+        """Start serving on a free local port."""
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                body = stub._encoded.get(urlparse(self.path).path)
+                delay = stub._delay()
+                if delay:
+                    time.sleep(delay)
+                if body is None:
+                    self.send_response(404)
+                    body = b'{"message": "Not Found"}'
+                else:
+                    self.send_response(200)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass
+
+        self._server = _StubHTTPServer(("127.0.0.1", 0), Handler)
+        self._thread = threading.Thread(
+            target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        """Stop the server."""
+        if self._server:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc_info):
+        self.stop()
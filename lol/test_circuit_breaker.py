@@ -0,0 +1,183 @@
+"""
+Unit tests for the circuit breaker and the offline refresh queue.
+Run with: python -m unittest test_circuit_breaker (or pytest)
+"""
+
+import threading
+import unittest
+from unittest import mock
+import requests
+from api_f1 import F1API
+from circuit_breaker import CircuitBreaker
+from key_pool import KeyPool
+from response_cache import ResponseCache
+from stub_server import StubServer
+
+# Nothing listens on the discard port, so connections fail immediately
+UNREACHABLE_URL = "http://127.0.0.1:9"
+
+
+class CircuitBreakerTest(unittest.TestCase):
+
+    def test_opens_after_threshold(self):
+        breaker = CircuitBreaker(failure_threshold=3, reset_timeout=30)
+        for _ in range(2):
+            breaker.record_failure(now=0)
+        self.assertTrue(breaker.allow_request(now=0))
+
+        breaker.record_failure(now=0)
+        self.assertTrue(breaker.is_open)
+        self.assertFalse(breaker.allow_request(now=29))
+
+    def test_success_resets_failure_count(self):
+        breaker = CircuitBreaker(failure_threshold=3)
+        breaker.record_failure(now=0)
+        breaker.record_failure(now=0)
+        breaker.record_success()
+        breaker.record_failure(now=0)
+        self.assertEqual(breaker.state, CircuitBreaker.CLOSED)
+
+    def test_half_open_allows_a_single_probe(self):
+        breaker = CircuitBreaker(failure_threshold=1, reset_timeout=30)
+        breaker.record_failure(now=0)
+
+        self.assertTrue(breaker.allow_request(now=30))
+        self.assertEqual(breaker.state, CircuitBreaker.HALF_OPEN)
+        self.assertFalse(breaker.allow_request(now=31))
+
+        breaker.record_success()
+        self.assertEqual(breaker.state, CircuitBreaker.CLOSED)
+        self.assertTrue(breaker.allow_request(now=32))
+
+    def test_failed_probe_reopens(self):
+        breaker = CircuitBreaker(failure_threshold=3, reset_timeout=30)
+        for _ in range(3):
+            breaker.record_failure(now=0)
+        self.assertTrue(breaker.allow_request(now=30))
+
+        breaker.record_failure(now=30)
+        self.assertEqual(breaker.state, CircuitBreaker.OPEN)
+        self.assertFalse(breaker.allow_request(now=59))
+        self.assertTrue(breaker.allow_request(now=60))
+
+    def test_ready_does_not_take_the_probe(self):
+        breaker = CircuitBreaker(failure_threshold=1, reset_timeout=30)
+        breaker.record_failure(now=0)
+        self.assertFalse(breaker.ready(now=10))
+        self.assertTrue(breaker.ready(now=30))
+        self.assertTrue(breaker.ready(now=30))
+        self.assertTrue(breaker.allow_request(now=30))
+        self.assertFalse(breaker.ready(now=30))
+
+    def test_release_frees_only_this_threads_probe(self):
+        breaker = CircuitBreaker(failure_threshold=1, reset_timeout=30)
+        breaker.record_failure(now=0)
+        self.assertTrue(breaker.allow_request(now=30))
+
+        other = threading.Thread(target=breaker.release)
+        other.start()
+        other.join()
+        self.assertFalse(breaker.ready(now=30))
+
+        breaker.release()
+        self.assertEqual(breaker.state, CircuitBreaker.HALF_OPEN)
+        self.assertTrue(breaker.ready(now=30))
+
+
+def http_response(status_code):
+    """Build a requests.Response with a status code and empty body."""
+    response = requests.Response()
+    response.status_code = status_code
+    response.url = "http://stub/"
+    response._content = b""
+    return response
+
+
+class ProbeReleaseTest(unittest.TestCase):
+
+    def setUp(self):
+        self.f1_api = F1API()
+        self.f1_api.base_url = UNREACHABLE_URL
+        self.breaker = CircuitBreaker(failure_threshold=3, reset_timeout=0)
+        self.f1_api.circuit_breaker = self.breaker
+        for _ in range(3):
+            self.breaker.record_failure()
+
+    def test_probe_released_when_no_key_is_available(self):
+        self.f1_api.key_pool = KeyPool(["key-one-aaaa"])
+        self.f1_api.key_pool.record_response(
+            self.f1_api.key_pool.keys[0], 403, {})
+
+        self.assertIsNone(self.f1_api.make_request("/stats"))
+        self.assertTrue(self.breaker.ready())
+        self.assertTrue(self.breaker.allow_request())
+
+    def test_probe_released_after_other_request_errors(self):
+        self.f1_api.key_pool = None
+        error = requests.exceptions.ChunkedEncodingError("truncated body")
+        with mock.patch("requests.get", side_effect=error):
+            self.assertIsNone(self.f1_api.make_request("/stats"))
+
+        self.assertTrue(self.breaker.ready())
+        self.assertTrue(self.breaker.allow_request())
+
+
+class RefreshQueueTest(unittest.TestCase):
+
+    def setUp(self):
+        self.f1_api = F1API()
+        self.f1_api.key_pool = None
+        self.f1_api.cache = ResponseCache()
+
+    def serve_offline(self, endpoint_type, **params):
+        """Cache a stale copy, then fetch it while the network is down."""
+        endpoint = self.f1_api.ENDPOINTS.get(endpoint_type)
+        key = self.f1_api.cache.make_key(
+            endpoint.path, endpoint.build_params(params))
+        self.f1_api.cache.set(key, endpoint.response_type())
+        self.f1_api.base_url = UNREACHABLE_URL
+        data = self.f1_api.fetch_data(endpoint_type=endpoint_type, cache_ttl=0,
+                                      **params)
+        self.assertEqual(self.f1_api.last_source()[0], "offline")
+        return data
+
+    def test_offline_fetch_serves_cache_and_queues_refresh(self):
+        self.serve_offline('stats', driverId='4665')
+        self.assertEqual(len(self.f1_api.pending_refreshes), 1)
+        self.assertIn("[Offline]", self.f1_api.staleness_note())
+
+    def test_open_circuit_skips_the_network(self):
+        self.f1_api.circuit_breaker = CircuitBreaker(failure_threshold=1)
+        self.serve_offline('stats', driverId='4665')
+        self.assertTrue(self.f1_api.is_offline())
+
+        sent = self.f1_api.requests_sent
+        self.serve_offline('stats', driverId='4665')
+        self.assertEqual(self.f1_api.requests_sent, sent)
+        self.assertEqual(self.f1_api.process_refresh_queue(), 0)
+
+    def test_only_successful_replays_count(self):
+        self.serve_offline('stats', driverId='4665')
+        self.serve_offline('race-report', eventId='600041134')
+
+        # The stub only knows /race-report; /stats answers 404, which
+        # replaying can't fix, so it is dropped rather than retried
+        with StubServer(payloads={"/race-report": {"report": {}}}) as stub:
+            self.f1_api.base_url = stub.base_url
+            self.assertEqual(self.f1_api.process_refresh_queue(), 1)
+
+        self.assertEqual(list(self.f1_api.pending_refreshes), [])
+
+    def test_server_errors_stay_queued(self):
+        self.serve_offline('stats', driverId='4665')
+        self.f1_api.base_url = "http://stub"
+        for status_code in (500, 429):
+            with mock.patch("requests.get",
+                            return_value=http_response(status_code)):
+                self.assertEqual(self.f1_api.process_refresh_queue(), 0)
+            self.assertEqual(list(self.f1_api.pending_refreshes),
+                             ["/stats?driverId=4665"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,83 @@
+"""
+Unit tests for keyed change detection.
+Run with: python -m unittest test_diff_engine (or pytest)
+"""
+
+import unittest
+from diff_engine import DiffEngine
+
+
+def race(date, name, place, points=0):
+    return {'date': date, 'race': name, 'place': place, 'points': points}
+
+
+class DiffEngineTest(unittest.TestCase):
+
+    def test_added_changed_removed(self):
+        engine = DiffEngine()
+        old = [race('3/2', 'Bahrain', 1, 25), race('3/9', 'Saudi', 1, 25)]
+        new = [race('3/2', 'Bahrain', 1, 26), race('3/24', 'Australia', 'DNF')]
+
+        changes = engine.diff('race-results', old, new)
+
+        self.assertEqual(list(changes.added), [('3/24', 'Australia')])
+        self.assertEqual(list(changes.changed), [('3/2', 'Bahrain')])
+        self.assertEqual(list(changes.removed), [('3/9', 'Saudi')])
+        self.assertEqual(len(changes), 3)
+
+    def test_reordered_rows_are_unchanged(self):
+        engine = DiffEngine()
+        rows = [race('3/2', 'Bahrain', 1), race('3/9', 'Saudi', 2)]
+        self.assertFalse(engine.diff('race-results', rows, rows[::-1]))
+
+    def test_duplicate_keys_survive_unrelated_inserts(self):
+        engine = DiffEngine()
+        duplicates = [race('3/2', 'Bahrain', place) for place in (1, 2, 3)]
+        inserted = [race('1/1', 'Season opener', 5)] + duplicates
+
+        changes = engine.diff('race-results', duplicates, inserted)
+
+        self.assertEqual(list(changes.added), [('1/1', 'Season opener')])
+        self.assertFalse(changes.changed or changes.removed)
+
+    def test_duplicate_keys_are_all_kept(self):
+        engine = DiffEngine()
+        rows = [race('3/2', 'Bahrain', place) for place in (1, 2, 3)]
+        self.assertEqual(len(engine.index('race-results', rows)), 3)
+
+    def test_update_notifies_listeners_only_on_change(self):
+        engine = DiffEngine()
+        received = []
+        engine.add_listener(received.append)
+        params = {'driverId': '4665'}
+        stats = [{'year': 2023, 'wins': 19}]
+
+        engine.update('stats', params, stats)
+        engine.update('stats', params, stats)
+        engine.update('stats', params, [{'year': 2023, 'wins': 20}])
+
+        self.assertEqual([len(c) for c in received], [1, 1])
+        self.assertEqual(list(received[1].changed), [(2023,)])
+        self.assertEqual(received[1].params, params)
+
+    def test_dict_responses_are_keyed_by_top_level_keys(self):
+        engine = DiffEngine()
+        changes = engine.diff('athlete-info', {'fullName': 'A', 'team': 'X'},
+                              {'fullName': 'A', 'team': 'Y'})
+        self.assertEqual(list(changes.changed), ['team'])
+
+    def test_failing_listener_does_not_stop_others(self):
+        engine = DiffEngine()
+        received = []
+
+        def broken(changes):
+            raise RuntimeError("boom")
+
+        engine.add_listener(broken)
+        engine.add_listener(received.append)
+        engine.update('stats', {'driverId': '1'}, [{'year': 2024}])
+        self.assertEqual(len(received), 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
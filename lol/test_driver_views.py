@@ -0,0 +1,124 @@
+"""
+Unit tests for the materialized driver views.
+Run with: python -m unittest test_driver_views (or pytest)
+"""
+
+import random
+import sys
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+from api_f1 import F1API
+from driver_views import DriverViews
+
+DRIVERS = F1API.DRIVERS_2024
+
+
+def season_results(rng, races=24):
+    """Random race-results rows for one driver and season."""
+    rows = []
+    for number in range(races):
+        place = rng.choice([rng.randint(1, 20), 'DNF'])
+        points = max(0, 26 - place) if place != 'DNF' else 0
+        rows.append({'date': f"{number % 12 + 1}/{number + 1}",
+                     'race': f"Grand Prix {number + 1}",
+                     'place': place, 'points': points})
+    return rows
+
+
+def career_stats(rng):
+    """Random stats rows for one driver."""
+    return [{'year': year, 'rank': rng.randint(1, 20),
+             'starts': 22, 'wins': rng.randint(0, 10),
+             'poles': rng.randint(0, 10), 'top5': rng.randint(0, 15),
+             'top10': rng.randint(0, 20), 'points': rng.randint(0, 400)}
+            for year in range(2018, 2025) if rng.random() < 0.8]
+
+
+def snapshot(views):
+    """Every query result the views answer, for comparing two instances."""
+    ids = [driver['id'] for driver in DRIVERS.values()]
+    return {
+        'leaderboard': views.leaderboard('2024'),
+        'battles': [views.teammate_battle(driver_id) for driver_id in ids],
+        'compare': [views.compare(a, b) for a, b in zip(ids, ids[1:])],
+    }
+
+
+def load(views, results, stats):
+    for driver_id, rows in results.items():
+        views.update('race-results', {'driverId': driver_id, 'year': '2024'},
+                     rows)
+    for driver_id, rows in stats.items():
+        views.update('stats', {'driverId': driver_id}, rows)
+
+
+class DriverViewsTest(unittest.TestCase):
+
+    def test_incremental_updates_match_a_fresh_load(self):
+        rng = random.Random(2024)
+        ids = [driver['id'] for driver in DRIVERS.values()]
+        incremental = DriverViews(DRIVERS)
+
+        for _ in range(5):
+            results = {driver_id: season_results(rng, rng.randint(10, 24))
+                       for driver_id in ids}
+            stats = {driver_id: career_stats(rng) for driver_id in ids}
+            load(incremental, results, stats)
+
+        fresh = DriverViews(DRIVERS)
+        load(fresh, results, stats)
+        self.assertEqual(snapshot(incremental), snapshot(fresh))
+
+    def test_leaderboard_is_sorted_by_points(self):
+        views = DriverViews(DRIVERS)
+        views.update('race-results', {'driverId': '4665', 'year': '2024'},
+                     [{'date': '3/2', 'race': 'Bahrain', 'place': 1,
+                       'points': 25}])
+        views.update('race-results', {'driverId': '4444', 'year': '2024'},
+                     [{'date': '3/2', 'race': 'Bahrain', 'place': 2,
+                       'points': 18},
+                      {'date': '3/9', 'race': 'Saudi', 'place': 1,
+                       'points': 25}])
+        self.assertEqual(views.leaderboard('2024'),
+                         [('4444', 43), ('4665', 25)])
+        self.assertIn("2 OF 20 DRIVERS LOADED",
+                      views.format_leaderboard('2024'))
+
+    def test_teammate_head_to_head(self):
+        views = DriverViews(DRIVERS)
+        verstappen = [{'date': '3/2', 'race': 'Bahrain', 'place': 1},
+                      {'date': '3/9', 'race': 'Saudi', 'place': 'DNF'}]
+        perez = [{'date': '3/2', 'race': 'Bahrain', 'place': 2},
+                 {'date': '3/9', 'race': 'Saudi', 'place': 4}]
+        views.update('race-results', {'driverId': '4665', 'year': '2024'},
+                     verstappen)
+        views.update('race-results', {'driverId': '4662', 'year': '2024'},
+                     perez)
+        self.assertEqual(views.teammate_battle('4665'), ('4662', 1, 1))
+
+    def test_concurrent_updates_keep_one_row_per_driver(self):
+        rng = random.Random(7)
+        rounds = [{driver['id']: season_results(rng)
+                   for driver in DRIVERS.values()} for _ in range(30)]
+        interval = sys.getswitchinterval()
+        sys.setswitchinterval(1e-6)
+        try:
+            views = DriverViews(DRIVERS)
+            for results in rounds:
+                with ThreadPoolExecutor(8) as executor:
+                    list(executor.map(
+                        lambda item: views.update(
+                            'race-results',
+                            {'driverId': item[0], 'year': '2024'}, item[1]),
+                        results.items()))
+        finally:
+            sys.setswitchinterval(interval)
+
+        fresh = DriverViews(DRIVERS)
+        load(fresh, rounds[-1], {})
+        self.assertEqual(len(views.leaderboard('2024')), len(DRIVERS))
+        self.assertEqual(views.leaderboard('2024'), fresh.leaderboard('2024'))
+
+
+if __name__ == "__main__":
+    unittest.main()
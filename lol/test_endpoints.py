@@ -0,0 +1,102 @@
+"""
+Unit tests for the declarative endpoint definitions.
+Run with: python -m unittest test_endpoints (or pytest)
+"""
+
+import io
+import unittest
+from contextlib import redirect_stdout
+from api_f1 import F1API
+from endpoints import DRIVER_ID, EVENT_ID, F1_ENDPOINTS, YEAR
+from response_cache import ResponseCache
+from stub_server import StubServer
+
+
+def validate(check, *args, **kwargs):
+    """Run a validator and return (result, printed message)."""
+    out = io.StringIO()
+    with redirect_stdout(out):
+        result = check(*args, **kwargs)
+    return result, out.getvalue().strip()
+
+
+class ParamTest(unittest.TestCase):
+
+    def test_messages_match_the_original_checks(self):
+        self.assertEqual(validate(EVENT_ID.validate, None),
+                         (False, "Error: Event ID is required."))
+        self.assertEqual(validate(DRIVER_ID.validate, ""),
+                         (False, "Error: Driver ID is required."))
+        self.assertEqual(validate(DRIVER_ID.validate, "46a5"),
+                         (False, "Invalid input. Driver ID should be numeric."))
+        self.assertEqual(validate(EVENT_ID.validate, 600041134), (True, ""))
+
+    def test_defaulted_param_is_optional(self):
+        self.assertEqual(validate(YEAR.validate, None), (True, ""))
+        self.assertEqual(validate(YEAR.validate, "20x4"),
+                         (False, "Invalid input. Year should be numeric."))
+
+
+class EndpointTest(unittest.TestCase):
+
+    def test_build_params_fills_defaults(self):
+        endpoint = F1_ENDPOINTS.get('race-results')
+        self.assertEqual(endpoint.build_params({'driverId': '4665'}),
+                         {'driverId': '4665', 'year': '2024'})
+        self.assertEqual(
+            endpoint.build_params({'driverId': '4665', 'year': '2023',
+                                   'cache_ttl': 0}),
+            {'driverId': '4665', 'year': '2023'})
+
+    def test_validate_input_without_endpoint_type(self):
+        f1_api = F1API()
+        self.assertEqual(validate(f1_api.validate_input, eventId='600041134'),
+                         (True, ""))
+        self.assertEqual(validate(f1_api.validate_input, driverId='max'),
+                         (False, "Invalid input. Driver ID should be numeric."))
+        self.assertEqual(validate(f1_api.validate_input, athleteId=''),
+                         (False, "Error: Driver ID is required."))
+        self.assertEqual(validate(f1_api.validate_input, unknown='1'),
+                         (False, ""))
+        self.assertEqual(validate(f1_api.validate_input), (False, ""))
+
+    def test_validate_input_with_unknown_endpoint_type(self):
+        f1_api = F1API()
+        self.assertEqual(
+            validate(f1_api.validate_input, endpoint_type='laps'),
+            (False, "Error: Unknown endpoint type 'laps'."))
+
+
+class ResponseTypeTest(unittest.TestCase):
+
+    def setUp(self):
+        self.f1_api = F1API()
+        self.f1_api.key_pool = None
+        self.f1_api.circuit_breaker = None
+        self.f1_api.cache = ResponseCache()
+
+    def test_wrong_response_type_is_rejected_and_not_cached(self):
+        payloads = {"/stats": {"message": "not a list"},
+                    "/race-report": {"report": {}}}
+        with StubServer(payloads=payloads) as stub:
+            self.f1_api.base_url = stub.base_url
+            data, message = validate(self.f1_api.fetch_data,
+                                     endpoint_type='stats', driverId='4665')
+            self.assertIsNone(data)
+            self.assertEqual(message, "Error: Unexpected response from "
+                                      "/stats (expected a list).")
+            key = self.f1_api.cache.make_key("/stats", {'driverId': '4665'})
+            self.assertIsNone(self.f1_api.cache.get(key))
+
+            # A second fetch goes back to the network instead of the cache
+            validate(self.f1_api.fetch_data, endpoint_type='stats',
+                     driverId='4665')
+            self.assertEqual(stub.requests, 2)
+
+            report = self.f1_api.fetch_data(endpoint_type='race-report',
+                                            eventId='600041134')
+            self.assertEqual(report, {"report": {}})
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,104 @@
+"""
+Unit tests for the Parquet/CSV exporter.
+Run with: python -m unittest test_exporter (or pytest)
+"""
+
+import csv
+import os
+import shutil
+import tempfile
+import unittest
+from api_f1 import F1API
+from exporter import DataExporter, pa, pq
+from response_cache import ResponseCache
+from stub_server import StubServer
+
+PAYLOADS = {
+    "/race-results": [
+        {'date': '3/2', 'race': 'Bahrain', 'place': 1, 'start': 1,
+         'points': 26},
+        {'date': '3/9', 'race': 'Saudi', 'place': 'DNF', 'start': 3,
+         'points': 0},
+        {'date': '3/24', 'race': 'Australia', 'place': 2, 'start': 2,
+         'points': 18},
+    ],
+    "/stats": [{'year': year, 'rank': 1, 'starts': 22, 'wins': 10,
+                'poles': 5, 'top5': 15, 'top10': 20, 'points': 400}
+               for year in (2021, 2022, 2023, 2024)],
+    "/athlete-info": {'fullName': 'Max Verstappen', 'dateOfBirth': '1997',
+                      'birthPlace': {'city': 'Hasselt'},
+                      'vehicles': [{'team': 'Red Bull Racing',
+                                    'number': '1'}]},
+}
+
+
+class DataExporterTest(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.directory)
+        self.stub = StubServer(payloads=PAYLOADS)
+        self.stub.start()
+        self.addCleanup(self.stub.stop)
+
+        self.f1_api = F1API()
+        self.f1_api.key_pool = None
+        self.f1_api.circuit_breaker = None
+        self.f1_api.cache = ResponseCache()
+        self.f1_api.base_url = self.stub.base_url
+        self.drivers = list(F1API.DRIVERS_2024.values())[:2]
+
+    def path(self, *parts):
+        return os.path.join(self.directory, *parts)
+
+    def read_csv(self, *parts):
+        with open(self.path(*parts), newline="") as f:
+            return list(csv.DictReader(f))
+
+    def test_csv_is_partitioned_by_season(self):
+        exporter = DataExporter(self.f1_api, self.directory, "csv")
+        written = exporter.export(self.drivers, seasons=range(2023, 2025))
+
+        self.assertEqual(written, {'race_results': 12, 'stats': 4,
+                                   'athlete_info': 2})
+        self.assertEqual(sorted(os.listdir(self.path("race_results"))),
+                         ["season=2023", "season=2024"])
+        rows = self.read_csv("race_results", "season=2024", "part-0.csv")
+        self.assertEqual(len(rows), 6)
+        self.assertEqual(rows[1]['place'], 'DNF')
+        self.assertEqual(rows[0]['points'], '26.0')
+        info = self.read_csv("athlete_info", "part-0.csv")
+        self.assertEqual(info[0]['birth_city'], 'Hasselt')
+
+    def test_stats_are_limited_to_the_season_range(self):
+        exporter = DataExporter(self.f1_api, self.directory, "csv",
+                                partition_by_season=False)
+        exporter.export(self.drivers, seasons=range(2023, 2025),
+                        include_info=False)
+
+        self.assertFalse(os.path.exists(self.path("athlete_info")))
+        rows = self.read_csv("stats", "part-0.csv")
+        self.assertEqual(sorted({row['season'] for row in rows}),
+                         ['2023', '2024'])
+
+    @unittest.skipUnless(pa, "pyarrow is not installed")
+    def test_parquet_writes_one_row_group_per_batch(self):
+        exporter = DataExporter(self.f1_api, self.directory, "parquet",
+                                batch_size=2)
+        exporter.export(self.drivers, seasons=['2024'])
+
+        parquet = pq.ParquetFile(
+            self.path("race_results", "season=2024", "part-0.parquet"))
+        self.assertEqual(parquet.metadata.num_rows, 6)
+        self.assertEqual(parquet.num_row_groups, 3)
+        table = parquet.read()
+        self.assertEqual(str(table.schema.field('points').type), 'double')
+        self.assertEqual(table.column('season').to_pylist(), [2024] * 6)
+
+    def test_unsupported_format(self):
+        with self.assertRaises(ValueError):
+            DataExporter(self.f1_api, self.directory, "xlsx")
+
+
+if __name__ == "__main__":
+    unittest.main()
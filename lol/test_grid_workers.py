@@ -0,0 +1,55 @@
+"""
+Unit tests for the multi-process grid report builder.
+Run with: python -m unittest test_grid_workers (or pytest)
+"""
+
+import unittest
+from api_f1 import F1API
+from grid_workers import (RACE_FIELDS, GridReportBuilder, pack_rows,
+                          synthetic_tasks, unpack_rows)
+from response_cache import ResponseCache
+from stub_server import StubServer
+
+
+class GridReportBuilderTest(unittest.TestCase):
+
+    def setUp(self):
+        self.f1_api = F1API()
+        self.f1_api.key_pool = None
+        self.f1_api.circuit_breaker = None
+        self.f1_api.cache = ResponseCache()
+
+    def test_pack_rows_round_trip(self):
+        rows = [{'date': '3/2', 'race': 'Bahrain', 'place': 1, 'points': 26}]
+        self.assertEqual(unpack_rows(pack_rows(rows, RACE_FIELDS),
+                                     RACE_FIELDS), rows)
+
+    def test_worker_count_does_not_change_the_output(self):
+        tasks = synthetic_tasks(drivers=4, seasons=2, races=5)
+        single = GridReportBuilder(self.f1_api, workers=1).render(tasks)
+        sharded = GridReportBuilder(self.f1_api, workers=2).render(tasks)
+        self.assertEqual(len(single), 4)
+        self.assertEqual(single, sharded)
+
+    def test_report_from_stub_matches_across_workers(self):
+        drivers = list(F1API.DRIVERS_2024.values())[:3]
+        with StubServer() as stub:
+            self.f1_api.base_url = stub.base_url
+            reports = [GridReportBuilder(self.f1_api, workers=workers)
+                       .build_report(drivers, seasons=['2023', '2024'])
+                       for workers in (1, 2)]
+
+        self.assertEqual(reports[0], reports[1])
+        for driver in drivers:
+            self.assertIn(driver['name'], reports[0])
+
+    def test_empty_driver_list_fetches_nothing(self):
+        with StubServer() as stub:
+            self.f1_api.base_url = stub.base_url
+            builder = GridReportBuilder(self.f1_api, workers=1)
+            self.assertEqual(builder.fetch_tasks(drivers=[]), [])
+            self.assertEqual(stub.requests, 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
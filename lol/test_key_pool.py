@@ -0,0 +1,139 @@
+"""
+Unit tests for the API key pool.
+Run with: python -m unittest test_key_pool (or pytest)
+"""
+
+import unittest
+from unittest import mock
+from api_f1 import F1API
+from key_pool import KeyPool
+
+
+class FakeResponse:
+    """Minimal stand-in for requests.Response."""
+
+    def __init__(self, status_code, headers=None, data=None):
+        self.status_code = status_code
+        self.headers = headers or {}
+        self._data = data
+
+    def json(self):
+        return self._data
+
+    def raise_for_status(self):
+        pass
+
+
+class KeyPoolTest(unittest.TestCase):
+
+    def test_rotation_follows_remaining_quota(self):
+        pool = KeyPool(["key-one-aaaa", "key-two-bbbb", "key-three-cc"])
+        for key, remaining in zip(pool.keys, (3000, 2000, 1000)):
+            key.remaining = remaining
+
+        picks = [pool.acquire(now=0).key for _ in range(60)]
+
+        self.assertAlmostEqual(picks.count("key-one-aaaa"), 30, delta=1)
+        self.assertAlmostEqual(picks.count("key-two-bbbb"), 20, delta=1)
+        self.assertAlmostEqual(picks.count("key-three-cc"), 10, delta=1)
+
+    def test_rotation_is_smooth(self):
+        pool = KeyPool(["key-one-aaaa", "key-two-bbbb"])
+        picks = [pool.acquire(now=0).key for _ in range(6)]
+        # Equal (unknown) quotas alternate instead of bunching up
+        self.assertEqual(picks, ["key-one-aaaa", "key-two-bbbb"] * 3)
+
+    def test_unknown_quota_counts_as_best_known(self):
+        pool = KeyPool(["key-one-aaaa", "key-two-bbbb"])
+        pool.keys[0].remaining = 5000
+        picks = [pool.acquire(now=0).key for _ in range(20)]
+        self.assertEqual(picks.count("key-one-aaaa"), 10)
+
+    def test_rejected_key_sits_out_until_reset(self):
+        pool = KeyPool(["key-one-aaaa", "key-two-bbbb"])
+        first = pool.keys[0]
+        pool.record_response(first, 429, {KeyPool.RESET_HEADER: "120",
+                                          KeyPool.REMAINING_HEADER: "0"},
+                             now=1000)
+
+        self.assertEqual(first.failures, 1)
+        self.assertEqual(pool.available(now=1100), [pool.keys[1]])
+        self.assertTrue(all(pool.acquire(now=1100) is pool.keys[1]
+                            for _ in range(5)))
+        self.assertIn("HTTP 429", pool.usage(now=1100)[0]['status'])
+
+        # Window reset: the key is back with its stale quota forgotten
+        first.remaining = 0
+        picks = [pool.acquire(now=1121) for _ in range(4)]
+        self.assertIn(first, picks)
+        self.assertIsNone(first.disabled_reason)
+
+    def test_rejected_key_without_reset_header_uses_cooldown(self):
+        pool = KeyPool(["key-one-aaaa"], cooldown=60)
+        pool.record_response(pool.keys[0], 401, {}, now=1000)
+        self.assertIsNone(pool.acquire(now=1059))
+        self.assertIs(pool.acquire(now=1060), pool.keys[0])
+
+    def test_throttled_key_with_quota_left_sits_out_briefly(self):
+        pool = KeyPool(["key-one-aaaa"], cooldown=60)
+        key = pool.keys[0]
+        quota = {KeyPool.REMAINING_HEADER: "400",
+                 KeyPool.RESET_HEADER: "86400"}
+
+        pool.record_response(key, 429, dict(quota), now=1000)
+        self.assertIsNone(pool.acquire(now=1059))
+        self.assertIs(pool.acquire(now=1060), key)
+
+        pool.record_response(key, 429, dict(quota, **{
+            KeyPool.RETRY_AFTER_HEADER: "5"}), now=2000)
+        self.assertIsNone(pool.acquire(now=2004))
+        self.assertIs(pool.acquire(now=2005), key)
+
+    def test_exhausted_key_is_disabled(self):
+        pool = KeyPool(["key-one-aaaa", "key-two-bbbb"])
+        pool.record_response(pool.keys[0], 200, {
+            KeyPool.REMAINING_HEADER: "0", KeyPool.LIMIT_HEADER: "500",
+            KeyPool.RESET_HEADER: "3600"}, now=0)
+
+        self.assertEqual(pool.keys[0].limit, 500)
+        self.assertEqual(pool.keys[0].disabled_reason, "quota exhausted")
+        self.assertEqual(pool.available(now=10), [pool.keys[1]])
+
+    def test_all_keys_disabled(self):
+        pool = KeyPool(["key-one-aaaa", "key-two-bbbb"])
+        for key in pool.keys:
+            pool.record_response(key, 403, {}, now=0)
+        self.assertIsNone(pool.acquire(now=1))
+
+    def test_requires_a_key(self):
+        with self.assertRaises(ValueError):
+            KeyPool(["", None])
+
+
+class KeyRotationRequestTest(unittest.TestCase):
+
+    def test_make_request_retries_rejected_key(self):
+        f1_api = F1API()
+        f1_api.circuit_breaker = None
+        f1_api.key_pool = KeyPool(["key-one-aaaa", "key-two-bbbb"])
+        sent_with = []
+
+        def fake_get(url, params=None, headers=None, timeout=None):
+            key = headers[f1_api.api_key_header]
+            sent_with.append(key)
+            if key == "key-one-aaaa":
+                return FakeResponse(429)
+            return FakeResponse(200, data=[{"year": 2024}])
+
+        with mock.patch("requests.get", side_effect=fake_get):
+            data = f1_api.fetch_data(endpoint_type='stats', driverId='4665')
+
+        self.assertEqual(data, [{"year": 2024}])
+        self.assertEqual(sent_with, ["key-one-aaaa", "key-two-bbbb"])
+        self.assertEqual([key.requests for key in f1_api.key_pool.keys],
+                         [1, 1])
+        self.assertEqual(f1_api.key_pool.keys[0].disabled_reason, "HTTP 429")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,120 @@
+"""
+Unit tests for adaptive timeouts and hedged requests.
+Run with: python -m unittest test_latency_tracker (or pytest)
+"""
+
+import threading
+import time
+import unittest
+from unittest import mock
+from api_f1 import F1API
+from key_pool import KeyPool
+from latency_tracker import LatencyTracker
+from test_key_pool import FakeResponse
+
+STATS = [{"year": 2024}]
+
+
+class LatencyTrackerTest(unittest.TestCase):
+
+    def tracker(self, *samples):
+        tracker = LatencyTracker(min_samples=5, multiplier=3.0,
+                                 min_timeout=1.0)
+        for seconds in samples:
+            tracker.record("/stats", seconds)
+        return tracker
+
+    def test_timeout_uses_default_until_enough_samples(self):
+        tracker = self.tracker(*[0.5] * 4)
+        self.assertEqual(tracker.timeout_for("/stats", 10), 10)
+        tracker.record("/stats", 0.5)
+        self.assertEqual(tracker.timeout_for("/stats", 10), 1.5)
+
+    def test_timeout_is_clamped(self):
+        self.assertEqual(self.tracker(*[0.01] * 5).timeout_for("/stats", 10),
+                         1.0)
+        self.assertEqual(self.tracker(*[2.0] * 5).timeout_for("/stats", 5),
+                         5)
+
+    def test_hedge_delay_needs_min_samples(self):
+        tracker = self.tracker(*[0.1] * 4)
+        self.assertIsNone(tracker.hedge_delay("/stats"))
+        self.assertIsNone(tracker.hedge_delay("/race-report"))
+        tracker.record("/stats", 0.3)
+        self.assertEqual(tracker.hedge_delay("/stats"), 0.3)
+
+    def test_window_drops_old_samples(self):
+        tracker = LatencyTracker(window=5, min_samples=5)
+        for seconds in [9.0] * 5 + [0.1] * 5:
+            tracker.record("/stats", seconds)
+        self.assertEqual(tracker.percentile("/stats", 99), 0.1)
+
+
+class HedgingTest(unittest.TestCase):
+
+    def setUp(self):
+        self.f1_api = F1API()
+        self.f1_api.base_url = "http://stub"
+        self.f1_api.cache = None
+        self.f1_api.circuit_breaker = None
+        self.f1_api.key_pool = None
+        self.f1_api.hedge_requests = True
+        # Hedge any copy still pending after 10 ms
+        self.f1_api.latency = LatencyTracker()
+        self.f1_api.latency.hedge_delay = lambda endpoint: 0.01
+        self.sent_with = []
+        self._lock = threading.Lock()
+
+    def fake_get(self, slow_keys=None, slow=0.2):
+        """requests.get stand-in; slow for every call or for `slow_keys`."""
+        def get(url, params=None, headers=None, timeout=None):
+            key = headers.get(self.f1_api.api_key_header)
+            with self._lock:
+                self.sent_with.append(key)
+            if slow_keys is None or key in slow_keys:
+                time.sleep(slow)
+            return FakeResponse(200, data=STATS)
+        return get
+
+    def test_hedge_uses_its_own_pooled_key(self):
+        pool = self.f1_api.key_pool = KeyPool(["key-one-aaaa",
+                                               "key-two-bbbb"])
+        get = self.fake_get(slow_keys={"key-one-aaaa"})
+        with mock.patch("requests.get", side_effect=get):
+            data = self.f1_api.make_request("/stats", cache_ttl=0)
+
+        self.assertEqual(data, STATS)
+        self.assertEqual(self.f1_api.hedges_sent, 1)
+        self.assertEqual(self.sent_with, ["key-one-aaaa", "key-two-bbbb"])
+        self.assertEqual([key.requests for key in pool.keys], [1, 1])
+
+    def test_no_hedge_without_a_spare_key(self):
+        pool = self.f1_api.key_pool = KeyPool(["key-one-aaaa"])
+        with mock.patch.object(pool, "acquire",
+                               side_effect=[pool.keys[0], None]), \
+                mock.patch("requests.get", side_effect=self.fake_get(
+                    slow=0.05)):
+            data = self.f1_api.make_request("/stats", cache_ttl=0)
+
+        self.assertEqual(data, STATS)
+        self.assertEqual(self.f1_api.hedges_sent, 0)
+        self.assertEqual(self.sent_with, ["key-one-aaaa"])
+
+    def test_hedges_stay_within_budget(self):
+        with mock.patch("requests.get",
+                        side_effect=self.fake_get(slow=0.05)):
+            for _ in range(11):
+                self.f1_api.make_request("/stats", cache_ttl=0)
+
+        # 10% budget: one hedge for the first request, the next at the 11th
+        self.assertEqual(self.f1_api.requests_sent, 11)
+        self.assertEqual(self.f1_api.hedges_sent, 2)
+
+    def test_fast_responses_are_not_hedged(self):
+        with mock.patch("requests.get", side_effect=self.fake_get(slow=0)):
+            self.f1_api.make_request("/stats", cache_ttl=0)
+        self.assertEqual(self.f1_api.hedges_sent, 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,121 @@
+"""
+Unit tests for the live polling engine.
+Run with: python -m unittest test_live_poller (or pytest)
+"""
+
+import sys
+import threading
+import time
+import unittest
+from endpoints import F1_ENDPOINTS
+from live_poller import LivePoller, RateBudget
+
+
+class FakeAPI:
+    """Returns queued responses; an Exception in the queue is raised."""
+
+    ENDPOINTS = F1_ENDPOINTS
+
+    def __init__(self, *responses):
+        self.responses = list(responses)
+        self.calls = 0
+
+    def fetch_data(self, **kwargs):
+        self.calls += 1
+        response = self.responses[min(self.calls, len(self.responses)) - 1]
+        if isinstance(response, Exception):
+            raise response
+        return response
+
+
+class LivePollerTest(unittest.TestCase):
+
+    def test_changes_are_published_once(self):
+        rows = [{'date': '3/2', 'race': 'Bahrain', 'place': 1}]
+        poller = LivePoller(FakeAPI(rows, rows), RateBudget(6000))
+        received = []
+        subscription = poller.subscribe_driver(
+            '4665', callback=lambda s, changes: received.append(changes))
+
+        self.assertEqual(len(poller.poll_once()), 1)
+        self.assertEqual(poller.poll_once(now=subscription.next_poll), [])
+        self.assertEqual(len(received), 1)
+        self.assertEqual(subscription.polls, 2)
+
+    def test_unchanged_polls_back_off(self):
+        poller = LivePoller(FakeAPI([]), RateBudget(6000))
+        subscription = poller.subscribe_driver('4665')
+        intervals = []
+        for _ in range(3):
+            poller.poll_once(now=subscription.next_poll)
+            intervals.append(subscription.interval)
+        self.assertEqual(intervals, sorted(intervals))
+        self.assertGreater(intervals[-1], intervals[0])
+
+    def test_failing_fetch_backs_off(self):
+        fake_api = FakeAPI(RuntimeError("boom"))
+        poller = LivePoller(fake_api, RateBudget(6000))
+        subscription = poller.subscribe_driver('4665')
+
+        self.assertEqual(poller.poll_once(), [])
+        self.assertFalse(subscription.in_flight)
+        self.assertGreater(subscription.next_poll, time.monotonic())
+
+        # The background loop must not re-poll it on every tick
+        poller.start(tick=0.01)
+        time.sleep(0.2)
+        poller.stop()
+        self.assertEqual(fake_api.calls, 1)
+
+    def test_weekend_state_follows_the_most_active_event(self):
+        poller = LivePoller(FakeAPI([]), RateBudget(6000))
+        self.assertEqual(poller.weekend_state(), 'unknown')
+        poller.subscribe_event('1').session_state = 'finished'
+        poller.subscribe_event('2').session_state = 'live'
+        poller.subscribe_driver('4665').session_state = 'upcoming'
+        self.assertEqual(poller.weekend_state(), 'live')
+
+    def test_weekend_state_while_subscribing(self):
+        poller = LivePoller(FakeAPI([]), RateBudget(6000))
+        errors = []
+        done = threading.Event()
+
+        def read_states():
+            try:
+                while not done.is_set():
+                    poller.weekend_state()
+            except RuntimeError as e:
+                errors.append(e)
+
+        interval = sys.getswitchinterval()
+        sys.setswitchinterval(1e-6)
+        try:
+            reader = threading.Thread(target=read_states)
+            reader.start()
+            for event_id in range(2000):
+                poller.subscribe_event(event_id)
+            done.set()
+            reader.join()
+        finally:
+            sys.setswitchinterval(interval)
+        self.assertEqual(errors, [])
+
+    def test_resubscribing_returns_the_same_subscription(self):
+        poller = LivePoller(FakeAPI([]), RateBudget(6000))
+        first = poller.subscribe_event('600041134')
+        self.assertIs(poller.subscribe_event(600041134), first)
+        self.assertEqual(len(poller.subscriptions), 1)
+
+
+class RateBudgetTest(unittest.TestCase):
+
+    def test_budget_runs_dry(self):
+        budget = RateBudget(requests_per_minute=60, burst=2)
+        self.assertTrue(budget.try_acquire())
+        self.assertTrue(budget.try_acquire())
+        self.assertFalse(budget.try_acquire())
+        self.assertFalse(budget.acquire(timeout=0.01))
+
+
+if __name__ == "__main__":
+    unittest.main()
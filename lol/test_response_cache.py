@@ -0,0 +1,56 @@
+"""
+Unit tests for the compact response cache.
+Run with: python -m unittest test_response_cache (or pytest)
+"""
+
+import os
+import shutil
+import tempfile
+import unittest
+from response_cache import ResponseCache, available_codecs, varied_payloads
+
+
+class ResponseCacheTest(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.directory)
+
+    def test_codecs_round_trip(self):
+        for codec in available_codecs():
+            for payload in varied_payloads(count=2):
+                self.assertEqual(codec.decode(codec.encode(payload)), payload,
+                                 codec.name)
+
+    def test_entries_persist_on_disk(self):
+        ResponseCache(directory=self.directory).set("/stats?driverId=1",
+                                                    [{'year': 2024}])
+        cache = ResponseCache(directory=self.directory)
+        self.assertEqual(cache.get("/stats?driverId=1"), [{'year': 2024}])
+        self.assertEqual(
+            [name for name in os.listdir(self.directory)
+             if name.endswith(".tmp")], [])
+
+    def test_max_age(self):
+        cache = ResponseCache()
+        cache.set("key", {'a': 1})
+        self.assertIsNone(cache.get("key", max_age=-1))
+        self.assertEqual(cache.get("key", max_age=60), {'a': 1})
+
+    def test_truncated_entry_is_a_miss(self):
+        for codec in available_codecs():
+            ResponseCache(codec, directory=self.directory).set(
+                "key", varied_payloads(count=1)[0])
+            path, = [os.path.join(self.directory, name)
+                     for name in os.listdir(self.directory)]
+            with open(path, "r+b") as f:
+                f.truncate(os.path.getsize(path) // 2)
+
+            cache = ResponseCache(codec, directory=self.directory)
+            self.assertIsNone(cache.get_entry("key"), codec.name)
+            self.assertEqual(cache.misses, 1)
+            self.assertFalse(os.path.exists(path))
+
+
+if __name__ == "__main__":
+    unittest.main()